@@ -0,0 +1,46 @@
+"""Micro-benchmark: precompiled junk_strip() against the old re.sub per pattern loop."""
+
+# cSpell: disable
+# Usage: python benchmarks/bench_junk.py [subtitle files...]
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from subtotxt import junk_strip, subtitle  # noqa: E402
+
+resources = Path(__file__).parent.parent / "tests" / "resources"
+default_files = [resources / "SRT_The_Beekeeper_ClosedCaps.srt", resources / "SSA_The_Beekeeper_Japanese_400plus.ass"]
+
+
+def old_junk_strip(line, junklist):
+    """Strip junk the way junk_strip() did before patterns were compiled."""
+    for junk in junklist:
+        try:  # noqa: SIM105
+            line = re.sub(rf"{junk}", "", line)
+        except Exception:
+            pass
+    return line
+
+
+def bench(path, no_names, repeat=5):
+    """Time both versions over every line of a file, returns (old, new) best of repeat in seconds."""
+    lines = path.read_text(encoding="utf-8-sig", errors="replace").splitlines()
+    sub = subtitle()
+    sub.set_no_names(no_names)
+    patterns = [junk for _, junk in sub.junklist()]
+    assert [old_junk_strip(x, patterns) for x in lines] == [junk_strip(x, sub) for x in lines]
+    old = min(timeit.repeat(lambda: [old_junk_strip(x, patterns) for x in lines], number=1, repeat=repeat))
+    new = min(timeit.repeat(lambda: [junk_strip(x, sub) for x in lines], number=1, repeat=repeat))
+    return len(lines), old, new
+
+
+if __name__ == "__main__":
+    for f in [Path(x) for x in sys.argv[1:]] or default_files:
+        for no_names in (False, True):
+            n, old, new = bench(f, no_names)
+            print(
+                f"{f.name} nonames={no_names}: {n} lines, "
+                f"old {old * 1000:.1f}ms, new {new * 1000:.1f}ms, {old / new:.1f}x faster"
+            )
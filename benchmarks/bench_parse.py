@@ -0,0 +1,119 @@
+"""Micro-benchmark: the .srt/.vtt block parser and Format: line .ssa/.ass parser against the old regex parsers."""
+
+# cSpell: disable
+# Usage: python benchmarks/bench_parse.py [subtitle files...]
+import contextlib
+import io
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from subtotxt import ass_newlines, ass_time_re, cue, do_ass, do_srt, do_vtt, ms, subtitle, times  # noqa: E402
+
+resources = Path(__file__).parent.parent / "tests" / "resources"
+default_files = [
+    *sorted(resources.glob("SRT_The_Beekeeper*.srt")),
+    resources / "SSA_The_Beekeeper_Japanese_400plus.ass",
+]
+
+
+def old_srt(original):
+    """Parse .srt the way do_srt() did before the block parser."""
+    subnum = 1
+    start = end = 0
+    text = []
+    for line in original:
+        tc = next(original, "") if line.strip("\n") == str(subnum) else ""
+        if re.search("(.*:.*:.*-->.*:.*:.*)", tc):
+            subnum += 1
+            if text:
+                yield cue(start, end, "\n".join(text))
+                text = []
+            start, end = times(tc)
+        elif line.strip("\n") != "":
+            text.append(line.rstrip("\n"))
+        elif text:
+            yield cue(start, end, "\n".join(text))
+            text = []
+    if text:
+        yield cue(start, end, "\n".join(text))
+
+
+def old_vtt(original):
+    """Parse .vtt the way do_vtt() did before the block parser."""
+    subnum = 1
+    head = 1
+    start = end = 0
+    text = []
+    for line in original:
+        tc = next(original, "") if line.strip("\n") == str(subnum) else ""
+        if re.search("(.*:.*-->.*:.*)", tc):
+            subnum += 1
+            head = 0
+        elif re.search("(.*:.*-->.*:.*)", line):
+            tc = line
+            head = 0
+        elif line.strip("\n") != "" and head == 0:
+            text.append(line.rstrip("\n"))
+            continue
+        if text:
+            yield cue(start, end, "\n".join(text))
+            text = []
+        if tc:
+            start, end = times(tc)
+    if text:
+        yield cue(start, end, "\n".join(text))
+
+
+def old_ass_time(t):
+    """Read a .ssa/.ass time the way ass_time() did, always with a regex."""
+    tc = ass_time_re.match(t)
+    return ms(*tc.groups()) if tc else 0
+
+
+def old_ass(original):
+    """Parse .ssa/.ass the way do_ass() did before the Format: line parser, names left out."""
+    fv = ""
+    cues = []
+    for line in original:
+        if "ScriptType:" in line:
+            fv = line.split(": ")[1].strip()
+        if "Dialogue:" in line:
+            if fv == "":
+                x = re.findall(r"Dialogue:.*?,(.*?\.\d*),(.*?\.\d*),.*?,(.*?),.*?,.*?,.*?,(.*)", line)
+            else:
+                x = re.findall(r"Dialogue:.*?,(.*?\.\d*),(.*?\.\d*),(.*?),.*?,.*?,.*?,.*?,.*?,(.*)", line)
+            stc, etc, nom, txt = x[0]
+            cues.append(cue(old_ass_time(stc), old_ass_time(etc), ass_newlines(txt)))
+    cues.sort(key=lambda c: c.start)
+    yield from cues
+
+
+def bench(path, repeat=20):
+    """Time both parsers over a file, returns (cues, old, new) best of repeat in seconds."""
+    text = path.read_text(encoding="utf-8-sig", errors="replace")
+    old_parse, new_parse = {".vtt": (old_vtt, do_vtt), ".ass": (old_ass, do_ass), ".ssa": (old_ass, do_ass)}.get(
+        path.suffix, (old_srt, do_srt)
+    )
+    sub = subtitle()
+    sub.set_no_names(True)  # The old .ssa/.ass parser took the Style column for the name
+
+    def old():
+        return [c.text for c in old_parse(io.StringIO(text))]
+
+    def new():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [c.text for c in new_parse(io.StringIO(text), sub)]
+
+    cues = new()
+    if old() != cues:
+        print(f"{path.name}: parsers disagree, the old one loses or mangles subtitles here")
+    return len(cues), min(timeit.repeat(old, number=1, repeat=repeat)), min(timeit.repeat(new, number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    for f in [Path(x) for x in sys.argv[1:]] or default_files:
+        n, old, new = bench(f)
+        print(f"{f.name}: {n} cues, old {old * 1000:.1f}ms, new {new * 1000:.1f}ms, {old / new:.1f}x faster")
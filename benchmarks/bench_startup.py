@@ -0,0 +1,42 @@
+"""Startup benchmark: how long a fresh interpreter takes to import subtotxt and convert a tiny file."""
+
+# cSpell: disable
+# Usage: python benchmarks/bench_startup.py [runs]
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).parent.parent
+sample = root / "tests" / "resources" / "VTT_Simple_example.vtt"
+
+
+def timing(cmd, runs):
+    """Run cmd runs times, returns (best, median) in milliseconds."""
+    took = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        took.append((time.perf_counter() - t) * 1000)
+    return min(took), statistics.median(took)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        sub = Path(tmp) / sample.name
+        shutil.copy(sample, sub)
+        script = str(root / "subtotxt.py")
+        load = f"import sys\nsys.path.insert(0, {str(root)!r})\nimport subtotxt"
+        checks = {
+            "python -c pass": [sys.executable, "-c", "pass"],
+            "import subtotxt": [sys.executable, "-c", load],
+            "subtotxt.py --help": [sys.executable, script, "--help"],
+            "subtotxt.py -f tiny.vtt -o": [sys.executable, script, "-f", str(sub), "-o"],
+        }
+        for name, cmd in checks.items():
+            best, median = timing(cmd, runs)
+            print(f"{name:30} best {best:7.1f}ms  median {median:7.1f}ms")
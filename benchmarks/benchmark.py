@@ -0,0 +1,208 @@
+"""Benchmark each stage of a conversion over generated and sample subtitle files."""
+
+# cSpell: disable
+# Usage: python benchmarks/benchmark.py [--sizes 10000,100000,1000000] [--json out.json] [--compare old.json]
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import subtotxt  # noqa: E402
+
+here = Path(__file__).parent
+resources = here.parent / "tests" / "resources"
+stages = ["read", "detect", "decode", "sniff", "parse", "clean", "write"]
+words = ["the", "a", "bee", "keeper", "hive", "honey", "sting", "you'll", "hear", "now", "some", "time", "to", "look"]
+
+
+def sentence(rng, n):
+    """Make a line of subtitle text with the odd tag, name or closed caption thrown in."""
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 9))).capitalize()
+    extra = n % 7
+    if extra == 0:
+        text = f"<i>{text}</i>"
+    elif extra == 1:
+        text = f"[MUSIC] {text}"
+    elif extra == 2:
+        text = f"BOB: {text}"
+    elif extra == 3:
+        text = f"{{\\an8}}{text}"
+    return text + rng.choice([".", "?", "!", ",", ""])
+
+
+def stamp(ms, sep):
+    """Format milliseconds as hh:mm:ss<sep>mmm."""
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}{sep}{ms % 1000:03d}"
+
+
+def generate(fmt, cues, path):
+    """Write a synthetic subtitle file with this many cues, the same seed always gives the same file."""
+    rng = random.Random(cues)
+    with open(path, "w", encoding="utf_8", newline="\n") as f:
+        if fmt == "vtt":
+            f.write("WEBVTT\nKind: captions\nLanguage: en\n\n")
+        elif fmt == "ass":
+            f.write("[Script Info]\nScriptType: v4.00+\n\n[Events]\n")
+            f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+        for n in range(cues):
+            start = n * 2500 + rng.randint(0, 400)
+            if fmt == "ass" and n % 50 == 0:  # Nudge a few lines out of order
+                start += 3000
+            end = start + 2000
+            if fmt == "srt":
+                f.write(f"{n + 1}\n{stamp(start, ',')} --> {stamp(end, ',')}\n{sentence(rng, n)}\n")
+                if n % 3 == 0:
+                    f.write(f"{sentence(rng, n + 1)}\n")
+                f.write("\n")
+            elif fmt == "vtt":
+                f.write(f"{stamp(start, '.')} --> {stamp(end, '.')}\n{sentence(rng, n)}\n\n")
+            else:
+                t = [f"{stamp(x, '.')[1:-1]}" for x in (start, end)]
+                text = f"{sentence(rng, n)}\\N{sentence(rng, n)}"
+                f.write(f"Dialogue: 0,{t[0]},{t[1]},Default,Bob,0000,0000,0000,,{text}\n")
+
+
+def corpus(sizes, folder):
+    """Return the generated files (made if missing) followed by the sample files."""
+    folder.mkdir(parents=True, exist_ok=True)
+    files = []
+    for size in sizes:
+        for fmt in ("srt", "vtt", "ass"):
+            path = folder / f"synthetic_{size}.{fmt}"
+            if not path.is_file():
+                print(f"Generating {path.name}", file=sys.stderr)
+                generate(fmt, size, path)
+            files.append(path)
+    return files + sorted(resources.glob("*.*"))
+
+
+def run(path, opts, out):
+    """Convert one file stage by stage, returns seconds per stage plus counts."""
+    took = {}
+    clock = time.perf_counter
+    file, enc, sub = subtotxt.file_handler(), subtotxt.encoding(), subtotxt.subtitle()
+    file.set_file(path)
+    file.o = out
+    file.set_over(True)
+    sub.set_no_names(opts.nonames)
+    sub.one_line(opts.oneliners)
+    t = clock()
+    file.load()
+    took["read"] = clock() - t
+    t = clock()
+    enc.check_encoding(file.data, opts.detect)
+    enc.force_utf8(True)
+    took["detect"] = clock() - t
+    t = clock()
+    file.decode(enc)
+    took["decode"] = clock() - t
+    t = clock()
+    sub.testsub(file, enc)
+    took["sniff"] = clock() - t
+    t = clock()
+    with subtotxt.open_input(file, enc) as original:
+        cues = list(subtotxt.handler(sub)(original, sub))
+    took["parse"] = clock() - t
+    t = clock()
+    for line in subtotxt.cue_lines(cues, not opts.nonames):
+        subtotxt.process_line(line, sub)
+    took["clean"] = clock() - t
+    t = clock()
+    subtotxt.write_to_file(file, enc, sub)
+    took["write"] = clock() - t
+    return took, len(cues)
+
+
+def peak_memory(path, opts, out):
+    """Peak traced memory in bytes for a whole conversion, run separately as tracing slows things down."""
+    tracemalloc.start()
+    try:
+        subtotxt.convert_file(path, out, opts)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench(files, opts, repeat, memory):
+    """Benchmark every file, returns a list of result dicts."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "out.txt"
+        for path in files:
+            with contextlib.redirect_stdout(io.StringIO()):
+                runs = [run(path, opts, out) for _ in range(repeat)]
+                peak = peak_memory(path, opts, out) if memory else None
+            best = {stage: min(r[0][stage] for r in runs) for stage in stages}
+            total = sum(best.values())
+            size = path.stat().st_size
+            cues = runs[0][1]
+            results.append(
+                {
+                    "file": path.name,
+                    "bytes": size,
+                    "cues": cues,
+                    "seconds": best,
+                    "total": total,
+                    "cues_per_s": cues / total if total else 0,
+                    "mb_per_s": size / 1e6 / total if total else 0,
+                    "peak_bytes": peak,
+                }
+            )
+            show(results[-1])
+    return results
+
+
+def show(r):
+    """Print one result as a table row."""
+    cells = " ".join(f"{r['seconds'][s] * 1000:9.1f}" for s in stages)
+    peak = f"{r['peak_bytes'] / 1e6:8.1f}" if r["peak_bytes"] is not None else "       -"
+    print(f"{r['file'][:38]:38} {r['cues']:8} {cells} {r['cues_per_s']:10.0f} {r['mb_per_s']:7.2f} {peak}")
+
+
+def compare(results, old_file):
+    """Print the change in total time against a previous JSON report."""
+    old = {r["file"]: r for r in json.loads(Path(old_file).read_text())["results"]}
+    print(f"\nCompared with {old_file}:")
+    for r in results:
+        if r["file"] in old and old[r["file"]]["total"]:
+            change = (r["total"] / old[r["file"]]["total"] - 1) * 100
+            print(f"{r['file'][:38]:38} {change:+7.1f}% {'slower' if change > 0 else 'faster'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark subtotxt stage by stage.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Cue counts for generated files")
+    parser.add_argument("--corpus", default=str(here / "corpus"), help="Folder for generated files")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file, the best is kept")
+    parser.add_argument("--detect", choices=["fast", "full"], default="fast", help="Encoding detection mode")
+    parser.add_argument("--nonames", action="store_true", help="Benchmark with --nonames")
+    parser.add_argument("--oneliners", action="store_true", help="Benchmark with --oneliners")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory run")
+    parser.add_argument("--json", help="Save results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previous JSON file")
+    args = parser.parse_args()
+    opts = subtotxt.options(nonames=args.nonames, oneliners=args.oneliners, overwrite=True, detect=args.detect)
+    files = corpus([int(x) for x in args.sizes.split(",") if x], Path(args.corpus))
+    heads = " ".join(f"{s + ' ms':>9}" for s in stages)
+    print(f"{'file':38} {'cues':>8} {heads} {'cues/s':>10} {'MB/s':>7} {'peak MB':>8}")
+    results = bench(files, opts, args.repeat, not args.no_memory)
+    if args.json:
+        report = {
+            "version": subtotxt.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": vars(args),
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved {args.json}")
+    if args.compare:
+        compare(results, args.compare)
@@ -7,11 +7,23 @@
 # https://github.com/NebularNerd/subtotxt
 import sys
 import os
-import argparse
-import subprocess
+import io
+import mmap
 import re
+import codecs
+import time
+import json
+import shutil
+import hashlib
+import importlib
+import threading
 from pathlib import Path
-
+from functools import lru_cache
+from contextlib import contextmanager, nullcontext, suppress
+from heapq import heappush, heappop
+from collections import deque
+from copy import copy as clone
+from itertools import repeat, islice
 
 version = "2025-02-03"
 
@@ -19,6 +31,7 @@ version = "2025-02-03"
 def missing_modules_installer(required_modules):
     """Auto module installer, fairly clever, will run if it finds modules are missing."""
     import platform
+    import subprocess
 
     if float(platform.python_version().rsplit(".", 1)[0].strip()) < 3.12:  # pkg_resources method
         import pkg_resources
@@ -39,22 +52,26 @@ def missing_modules_installer(required_modules):
         print(f"Installing missing modules\n{y[:-2]}\nplease wait a few moments.")
         python = sys.executable
         subprocess.check_call([python, "-m", "pip", "install", *missing], stdout=subprocess.DEVNULL)
+        importlib.invalidate_caches()
         print("Done, thanks for waiting")
 
 
-# Install send2trash and charset_normalizer if missing.
-# https://pypi.org/project/Send2Trash/
-# https://github.com/Ousret/charset_normalizer
-
+def need(module, package):
+    """
+    Import a module the first time it's actually needed, installing it if missing.
 
-while True:
+    Keeps startup quick, most runs never need charset_normalizer (UTF-8 input) or send2trash.
+    """
     try:
-        from send2trash import send2trash
-        from charset_normalizer import from_path
-
-        break
+        return importlib.import_module(module)
     except ModuleNotFoundError:
-        missing_modules_installer({"send2trash", "charset-normalizer"})
+        missing_modules_installer({package})
+        return importlib.import_module(module)
+
+
+# send2trash and charset_normalizer are imported by need() when used, and installed if missing.
+# https://pypi.org/project/Send2Trash/
+# https://github.com/Ousret/charset_normalizer
 
 
 # 8888888b.  8888888888 8888888888 .d8888b.
@@ -76,9 +93,23 @@ class file_handler:
         self.o = None  # Output file
         self.c = None  # Copy file
         self.overw = None  # Overwrite
+        self.trash = True  # If True an old output is sent to the trash, else it is simply replaced
+        self.pipe = False  # If True read from stdin and write to stdout
+        self.chunked = False  # If True the input is too big to convert whole, it's converted as with --stream
+        self.data = None  # Raw bytes of the input (memory mapped if large), or the start of stdin
+        self.size = 0  # Bytes read
+        self.text = None  # Decoded input as a line view, shared by sniffing and parsing
+        self.key = None  # Cache key, if caching
+        self.writer = None  # If set, an io_threads pool that writes the output in the background
+        self.written = None  # Encoded output handed to the writer
 
     def set_file(self, i):
-        """Set file input, then create output names."""
+        """Set file input, then create output names. `-` means stdin/stdout."""
+        if str(i) == "-":
+            self.pipe = True
+            self.data = sys.stdin.buffer.read(head_sample)  # Sample for detection, replayed before the rest
+            print("Input file: <stdin>")
+            return
         i = Path(i)
         if i.is_file():
             self.i = i
@@ -92,24 +123,95 @@ class file_handler:
         """Overwrite existing output file without asking."""
         self.overw = x
 
+    def set_replace(self, x):
+        """Replace existing output file in place instead of sending it to the trash first."""
+        self.trash = not x
+
+    def load(self, stream=False, max_size=0, memory=0, data=None):
+        """
+        Read the input once, large files (or any in --stream mode) are memory mapped instead of copied.
+
+        data is the input if it has already been read (by --prefetch). Inputs over max_size bytes are
+        refused before anything is read. If converting the whole file would take more than memory bytes
+        (see memory_factor) it is mapped and converted a chunk at a time instead. 0 switches either check off.
+        """
+        if self.pipe:
+            return
+        if data is not None:
+            self.check_size(len(data), max_size, memory)
+            self.data, self.size = data, len(data)
+            return
+        with open(self.i, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.check_size(size, max_size, memory)
+            if size and (stream or self.chunked or size >= mmap_size):
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = f.read()
+        self.size = len(self.data)
+
+    def check_size(self, size, max_size, memory):
+        """Refuse an input of size bytes if it's over max_size, set chunked if converting it whole needs over memory."""
+        if max_size and size > max_size:
+            raise Exception(f"Input is {size / (1 << 20):.1f} MB, over the --max-size limit of {max_size >> 20} MB.")
+        self.chunked = bool(memory and size * memory_factor > memory)
+        if self.chunked:
+            print(f"Input is {size / (1 << 20):.1f} MB, converting a chunk at a time to stay within --memory")
+
+    def decode(self, enc):
+        """Decode the whole input once into a line view, the raw bytes are let go afterwards."""
+        self.text = io.StringIO(enc.decode(self.data), newline=None)  # Same newline handling as open()
+        self.data = None
+
 
 class encoding:
     """Figure out what encoding the subtitle has, override output encoding if desired."""
 
     def __init__(self):
         """Variables have the following purposes."""
-        self.res = None  # Check encoding
+        self.res = None  # Check encoding, charset_normalizer result if it was needed
         self.enc = None  # Detected encoding
         self.out = None  # Output encoding
+        self.confidence = 0  # Confidence of detected encoding, percent
+        self.sample = 1 << 20  # Bytes given to charset_normalizer in fast mode
+        self.text = None  # Text decoded by the fast check, handed over by decode()
+
+    def check_encoding(self, data, mode="full", partial=False, keep=True):
+        """
+        Guess encoding of data, the raw bytes (or a path, which is read).
 
-    def check_encoding(self):
-        """charset_normalizer guess encoding."""
-        self.res = from_path(file.i).best()
-        self.enc = self.res.encoding
-        if self.res is not None and self.enc == "utf_8" and self.res.bom:
-            self.enc += "_sig"  # adds sig for utf_8_sig/bom files
+        mode "full": charset_normalizer checks the whole file.
+        mode "fast": BOM, then strict ascii/UTF-8 decode, only if both fail does charset_normalizer
+        check the first self.sample bytes (the whole file if the sample looks like plain ascii).
+        partial=True: data is a stdin sample that may stop part way through a character.
+        keep=True: hold on to the text from the UTF-8 check so decode() doesn't need to do it again.
+        """
+        if isinstance(data, (str, os.PathLike)):
+            data = Path(data).read_bytes()
+        self.enc = None
+        if mode == "fast":
+            self.enc, self.text = quick_encoding(data, partial, keep and not partial)
+            self.confidence = 100
+        if self.enc is None:
+            from_bytes = need("charset_normalizer", "charset-normalizer").from_bytes
+            self.res = from_bytes(bytes(data[: self.sample] if mode == "fast" else data)).best()
+            if mode == "fast" and len(data) > self.sample and self.res is not None and self.res.encoding == "ascii":
+                self.res = from_bytes(bytes(data)).best()
+            if self.res is None:
+                raise Exception("Unable to detect character encoding.")
+            self.enc = self.res.encoding
+            self.confidence = int((1.0 - self.res.chaos) * 100)
+            if self.enc == "utf_8" and self.res.bom:
+                self.enc += "_sig"  # adds sig for utf_8_sig/bom files
+        if partial and self.enc == "ascii":
+            self.enc = "utf_8"  # Only a sample was checked, the rest might not be plain ascii
         print(f"Detected Character Encoding: {self.enc}")
-        print(f"Confidence of encoding: {int((1.0 - self.res.chaos) * 100)}%")
+        print(f"Confidence of encoding: {self.confidence}%")
+
+    def decode(self, data):
+        """Return data as text, reusing the fast check's decode if there was one."""
+        text, self.text = self.text, None
+        return text if text is not None else str(data, self.enc)
 
     def force_utf8(self, x):
         """Force UTF8 output regardless of input encoding."""
@@ -117,22 +219,150 @@ class encoding:
         self.out = "utf_8" if x else self.enc
 
 
+mmap_size = 16 << 20  # Inputs this big are memory mapped rather than read into memory
+memory_factor = 8  # Peak memory of converting a file whole, roughly, as a multiple of its size
+head_sample = 1 << 16  # Bytes of stdin (or a file converted a chunk at a time) held for detection
+binary_sample = 8 << 10  # Bytes at the start of an input checked for binary content before detection
+sniff_lines = 200  # Most lines looked at to work out the subtitle format
+sniff_sure = 10  # Score needed to stop looking early
+suffixes = {".srt", ".vtt", ".ssa", ".ass"}  # Files --dir picks up
+dedup_tail = 200  # Characters of kept text --dedup checks new lines against for overlaps
+write_buffer = 1 << 20  # Bytes buffered before each write to an output file
+copy_block = 1 << 20  # Bytes transcoded at a time by --copy
+watch_interval = 0.5  # Default seconds between --watch polls of the folder
+# Start of a subtitle timecode line, e.g. `00:00:18,590 --> 00:00:21,389` or `00:18.590 --> 00:21.389`
+time_pattern = r"(?:(\d+):)?(\d{1,2}):(\d{2})"  # [hours:]minutes:seconds
+timecode_re = re.compile(rf"{time_pattern}(?:(?P<srt>,)|\.)(\d+)\s*-->\s*{time_pattern}[,.](\d+)")
+ass_time_re = re.compile(rf"\s*{time_pattern}(?:\.(\d*))?")  # e.g. `0:01:41.70`
+
+# Byte order marks, UTF-32 first as its LE mark starts with the UTF-16 LE one
+boms = [
+    (codecs.BOM_UTF32_LE, "utf_32"),
+    (codecs.BOM_UTF32_BE, "utf_32"),
+    (codecs.BOM_UTF8, "utf_8_sig"),
+    (codecs.BOM_UTF16_LE, "utf_16"),
+    (codecs.BOM_UTF16_BE, "utf_16"),
+]
+
+
+def quick_encoding(data, partial=False, keep=True):
+    """
+    Cheap encoding check, returns (encoding, text) or (None, None) if a full check is needed.
+
+    partial=True allows data to stop part way through a character, for samples.
+    keep=True returns the decoded text, otherwise it's checked a block at a time and text is None.
+    """
+    head = bytes(data[:4])
+    for bom, name in boms:
+        if head.startswith(bom):
+            return name, None
+    decoder = codecs.getincrementaldecoder("utf_8")()
+    view = memoryview(data)
+    try:
+        if keep:
+            text = decoder.decode(view, final=not partial)
+            return ("ascii" if text.isascii() else "utf_8"), text
+        ascii = True
+        for n in range(0, len(view), 1 << 20):
+            end = n + (1 << 20)
+            ascii = decoder.decode(view[n:end]).isascii() and ascii
+        decoder.decode(b"", final=not partial)
+        return ("ascii" if ascii else "utf_8"), None
+    except UnicodeDecodeError:
+        return None, None
+    finally:
+        view.release()
+
+
+text_controls = "\t\n\v\f\r\x1b"  # Control characters that do turn up in text
+controls = bytes(c for c in range(32) if chr(c) not in text_controls)  # The ones that don't
+
+
+def looks_binary(head):
+    """
+    Check if the start of an input is binary data (e.g. a video renamed .srt) rather than text.
+
+    Only UTF-16/32 text has NUL bytes, so with any the start has to decode as one of those into text
+    without stray control characters. Otherwise more than a few control characters give it away.
+    """
+    head = bytes(head)
+    if head.startswith(tuple(bom for bom, _ in boms)):
+        return False
+    if b"\0" in head:
+        for name in ("utf_16_le", "utf_16_be", "utf_32_le", "utf_32_be"):
+            try:
+                text = codecs.getincrementaldecoder(name)().decode(head)
+            except UnicodeDecodeError:
+                continue
+            if sum(1 for c in text if c < " " and c not in text_controls) <= len(text) // 100:
+                return False
+        return True
+    return len(head) - len(head.translate(None, controls)) > len(head) // 20
+
+
+def ms(h, m, s, frac):
+    """Timecode parts to milliseconds, frac is the digits after the decimal point (any number of them)."""
+    return ((int(h or 0) * 60 + int(m)) * 60 + int(s)) * 1000 + int(((frac or "") + "000")[:3])
+
+
+def times(line):
+    """Return (start, end) milliseconds from a .srt/.vtt timecode line, (0, 0) if there isn't one."""
+    tc = timecode_re.search(line)
+    return (ms(*tc.group(1, 2, 3, 5)), ms(*tc.group(6, 7, 8, 9))) if tc else (0, 0)
+
+
+def ass_time(t):
+    """Return milliseconds from a .ssa/.ass time, 0 if it can't be read."""
+    try:  # Plain h:mm:ss.cc without a regex, it's read twice for every Dialogue line
+        h, m, s = t.split(":")
+        s, _, frac = s.partition(".")
+        return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + (int((frac + "00")[:3]) if frac else 0)
+    except ValueError:
+        tc = ass_time_re.match(t)
+        return ms(*tc.groups()) if tc else 0
+
+
+class cue:
+    """One subtitle, kept small so hundreds of thousands fit in memory."""
+
+    __slots__ = ("start", "end", "text", "name")
+
+    def __init__(self, start, end, text, name=""):
+        """Variables have the following purposes."""
+        self.start = start  # Start time, milliseconds
+        self.end = end  # End time, milliseconds
+        self.text = text  # Text, lines separated by \n
+        self.name = name  # Character speaking, if the format says
+
+    def __repr__(self):
+        """Show the cue for debugging."""
+        return f"cue({self.start}, {self.end}, {self.text!r}, {self.name!r})"
+
+
 class subtitle:
     """Wrangle and mangle to file into nice readable text."""
 
     def __init__(self):
         """Variables have the following purposes."""
         self.format = None  # Which subtitle format
-        self.text = ""  # The output text
-        self.text_finished = ""  # The output text after a final check
+        self.text = []  # The cleaned lines, joined into sentences on output by --oneliners
         self.prev = ""  # Previously read line, prevents duplicates
-        self.junk = None  # Junk remover list, set below
+        self.dedup = 0  # If set, lines seen within this many kept lines are dropped (rolling captions)
+        self.recent = deque()  # For dedup, the last kept lines in order
+        self.seen = set()  # For dedup, the same lines for quick lookups
+        self.kept = ""  # For dedup, what was kept of the last line once trimmed
+        self.tail = ""  # For dedup, the end of the text kept so far, overlaps can span lines
+        self.junk = ()  # Compiled junk remover list, set below
         self.no_names = False  # If True removes names from subtitles
         self.nosrt = False  # If True leaves subs in file order, not timecode order
         self.scr = False  # If True outputs to screen as each line processed
         self.oneline = False  # If True attempts to join longer lines
+        self.window = 0  # If set, --stream mode: .ssa/.ass lines held at once for sorting
+        self.lines = 0  # Lines processed, for --stats
+        self.subs = 0  # Junk removed, for --stats
+        self.stats = None  # stats for this file, if wanted
 
-    def testsub(self):
+    def testsub(self, file, enc):
         """
         Opens subtitle file and attempts to detect encoding used.
 
@@ -144,14 +374,48 @@ class subtitle:
         Chinese and near neighbours/dialects have many many encodings, sometimes the wrong one may
         be choosen but it should not affect output.
         """
-        with open(file.i, "r", encoding=enc.enc) as ts:
-            for line in ts:
-                if "WEBVTT" in line:
-                    self.format = "vtt"
-                if line.strip("\n") == "1" and re.search("(.*:.*:.*-->.*:.*:.*)", next(ts)):
-                    self.format = "srt"
-                if any(s in line for s in ["!:", "Timer:", "Style:", "Comment:", "Dialogue:", "ScriptType:"]):
-                    self.format = "ass"
+        if file.pipe:  # stdin sample, may end part way through a character
+            self.sniff(iter(file.data.decode(enc.enc, errors="ignore").splitlines(keepends=True)))
+            return
+        with open_input(file, enc) as ts:
+            self.sniff(ts)
+
+    def sniff(self, ts):
+        """
+        Set self.format from an iterator of lines, only the first sniff_lines are looked at.
+
+        Each signature found scores points for its format, we stop as soon as one format has
+        sniff_sure points and at least twice the score of any other.
+        """
+        score = {"srt": 0, "vtt": 0, "ass": 0}
+        prev = ""
+        for n, line in enumerate(islice(ts, sniff_lines)):
+            line = line.strip()
+            if n == 0 and line.lstrip("\ufeff").startswith("WEBVTT"):
+                score["vtt"] += sniff_sure
+            elif line.startswith(("[Script Info]", "ScriptType:")):
+                score["ass"] += sniff_sure
+            elif line.startswith(("!:", "Dialogue:", "Comment:", "[Events]", "[V4")):
+                score["ass"] += 3
+            elif line.startswith(("Style:", "Timer:", "Format:")):
+                score["ass"] += 1
+            else:
+                tc = timecode_re.match(line)
+                if tc and prev.isdigit():
+                    score["srt" if tc.group("srt") else "vtt"] += 5  # SRT uses a comma, WebVTT a dot
+                elif tc:
+                    score["vtt"] += 3  # Timecode without a number, only WebVTT allows that
+            prev = line
+            best, second = sorted(score.values(), reverse=True)[:2]
+            if best >= sniff_sure and best >= second * 2:
+                break
+        best = max(score, key=score.get)
+        self.format = best if score[best] else None
+
+    def output(self, lines=None):
+        """Yield each output line from the collected lines (or those given), whole sentences with --oneliners."""
+        lines = self.text if lines is None else lines
+        return join_sentences(lines) if self.oneline else iter(lines)
 
     def junklist(self):
         """
@@ -159,16 +423,18 @@ class subtitle:
 
         This list will grow/adapt over time.
         Escaping and r(raw) tag needed for special characters
+        Each entry is (trigger, pattern), the trigger is a character the pattern cannot match without,
+        lines without it skip that pattern entirely. Patterns are applied in this order.
         """
-        j = ["<.*?>", r"\{.*?\}", r"\[.*\]", r"\(.*\)", r"^-\s"]
+        j = [("<", "<.*?>"), ("{", r"\{.*?\}"), ("[", r"\[.*\]"), ("(", r"\(.*\)"), ("-", r"^-\s")]
         if self.no_names:
-            j.append("^.*?:")
+            j.append((":", "^.*?:"))
         return j
 
     def set_no_names(self, x):
         """If True: Strip names from lines, e.g.: `Blackadder: You're name is Bob?`."""
         self.no_names = x
-        self.junk = self.junklist()
+        self.junk = compile_junk(tuple(self.junklist()))
 
     def set_no_sort(self, x):
         """If True: Prevents .ass/.ssa subs from being sorted by timecode."""
@@ -178,14 +444,465 @@ class subtitle:
         """If True: Outputs processed content to screen/console."""
         self.scr = x
 
+    def set_dedup(self, x):
+        """Drop repeats within a window of x lines and overlaps with the previous line, 0 to switch off."""
+        self.dedup = max(0, x or 0)
+
     def one_line(self, x):
         """If True: Sets one line function, attempts to join split sentences."""
         self.oneline = x
 
 
+class options:
+    """
+    Conversion options, names match the command line arguments so parsed args can be used directly.
+
+    One set of options can be shared between any number of convert() calls.
+    """
+
+    def __init__(
+        self,
+        nonames=False,
+        nosort=False,
+        oneliners=False,
+        utf8=False,
+        screen=False,
+        overwrite=False,
+        stream=False,
+        window=1000,
+        detect="fast",
+        format=None,
+        stats=False,
+        cache=None,
+        dedup=0,
+        jobs=1,
+        prefetch=0,
+        replace=False,
+        copy=False,
+        outputs=None,
+        watch=0,
+        sync=False,
+        max_size=512,
+        memory=1024,
+    ):
+        """Variables have the following purposes."""
+        self.nonames = nonames  # If True removes names from subtitles
+        self.nosort = nosort  # If True leaves subs in file order, not timecode order
+        self.oneliners = oneliners  # If True attempts to join longer lines
+        self.utf8 = utf8  # If True forces UTF-8 output
+        self.screen = screen  # If True outputs to screen as each line processed
+        self.overwrite = overwrite  # If True overwrites existing output without asking
+        self.replace = replace  # If True existing output is replaced in place, not sent to the trash
+        self.copy = copy  # If True batches copy files to <name>-copy instead of converting
+        self.outputs = outputs  # If set, the variants to write from one parse, e.g. "plain,nonames+oneliners"
+        self.stream = stream  # If True converts line by line, memory use stays flat
+        self.window = window  # For stream, how many .ssa/.ass lines to hold for sorting
+        self.detect = detect  # Encoding detection, "fast" or "full"
+        self.format = format  # If set, skips detection and uses this subtitle format
+        self.stats = stats  # If True batch runs collect per file stats
+        self.cache = cache  # If set, a cache to reuse earlier conversions of unchanged files
+        self.dedup = dedup  # If set, drops lines repeated within this many lines, for rolling live captions
+        self.jobs = jobs  # For batches, worker processes to use (0 = one per CPU core)
+        self.prefetch = prefetch  # For batches in one process, files to read ahead and write behind on threads
+        self.watch = watch  # For watch(), seconds between polls of the folder (0 = watch_interval)
+        self.sync = sync  # For watch(), also watch sub folders and keep the sync() manifest up to date
+        self.max_size = max_size  # Inputs over this many MB are refused (0 = no limit)
+        self.memory = memory  # Inputs needing over this many MB to convert whole are converted in chunks (0 = off)
+
+
+class cache:
+    """
+    On disk cache of finished conversions for repeat batch runs.
+
+    Entries are keyed by a hash of the file content plus the options that change the output, and hold
+    the detected encoding, format and the finished output. A stat record per input path remembers size,
+    mtime and content hash, so unchanged files are served without being read or hashed at all.
+    Every record is its own file written atomically, so worker processes can share a cache.
+    """
+
+    tmp_age = 3600  # Seconds before a temporary file is taken to be left over from a crashed write
+
+    def __init__(self, folder, limit=256 << 20):
+        """Variables have the following purposes."""
+        self.folder = Path(folder)  # Where the cache lives
+        self.limit = limit  # Bytes kept before the least recently used entries are removed
+
+    def key(self, digest, opts):
+        """Cache key for content digest and the options that change the output."""
+        o = [opts.nonames, opts.nosort, opts.oneliners, opts.utf8, opts.format, opts.stream and opts.window]
+        o += [opts.dedup, version]
+        return hashlib.blake2b(f"{digest}{o}".encode(), digest_size=16).hexdigest()
+
+    def stat_record(self, path):
+        """Path of the stat record for an input file."""
+        name = hashlib.blake2b(str(Path(path).resolve()).encode(), digest_size=16).hexdigest()
+        return self.folder / "stat" / f"{name}.json"
+
+    def known(self, path, opts):
+        """Return the key for path if its size and mtime match the stat record, without reading it, else None."""
+        record = self.stat_record(path)
+        try:
+            size, mtime, digest = json.loads(record.read_text())
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        if (size, mtime) != (st.st_size, st.st_mtime_ns):
+            return None
+        with suppress(OSError):
+            os.utime(record)  # Recently used
+        return self.key(digest, opts)
+
+    def remember(self, path, data, opts):
+        """Hash already loaded input data, record it against path, returns the key."""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        st = os.stat(path)
+        self.write(self.stat_record(path), json.dumps([st.st_size, st.st_mtime_ns, digest]).encode())
+        return self.key(digest, opts)
+
+    def get(self, key):
+        """Return (meta, output path or None) for key, or (None, None) if it isn't cached."""
+        meta = self.folder / key[:2] / f"{key}.json"
+        try:
+            info = json.loads(meta.read_text())
+            os.utime(meta)  # Recently used
+        except (OSError, ValueError):
+            return None, None
+        text = meta.with_suffix(".txt")
+        return info, (text if text.is_file() else None)
+
+    def put(self, key, info, output=None):
+        """Store meta for key, plus a copy of the output if given, from a file or bytes."""
+        meta = self.folder / key[:2] / f"{key}.json"
+        size = output and (len(output) if isinstance(output, bytes) else output.stat().st_size)
+        if output is not None and size <= self.limit // 8:
+            self.write(meta.with_suffix(".txt"), output)
+        self.write(meta, json.dumps(info).encode())
+
+    def write(self, target, content):
+        """Write bytes (or copy a file) to target atomically."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        if isinstance(content, Path):
+            shutil.copyfile(content, tmp)
+        else:
+            tmp.write_bytes(content)
+        os.replace(tmp, target)
+
+    def trim(self):
+        """
+        Remove least recently used entries until the cache fits in self.limit.
+
+        Stat records are entries too, an output counts with its meta (or alone if the meta never got
+        written) and temporary files older than tmp_age are removed.
+        """
+        entries = {}  # Path without suffix: (last used, bytes, files)
+        old = time.time() - self.tmp_age
+        for f in self.folder.glob("*/*"):
+            try:
+                st = f.stat()
+                if f.suffix == ".tmp":
+                    if st.st_mtime < old:
+                        f.unlink()
+                    continue
+            except OSError:
+                continue
+            used, size, files = entries.get(f.with_suffix(""), (0, 0, []))
+            entries[f.with_suffix("")] = (max(used, st.st_mtime), size + st.st_size, [*files, f])
+        total = sum(size for _, size, _ in entries.values())
+        for _, size, files in sorted(entries.values(), key=lambda e: e[0]):
+            if total <= self.limit:
+                break
+            for f in files:
+                with suppress(OSError):
+                    f.unlink()
+            total -= size
+
+
+class manifest:
+    """
+    Record of what --sync converted last time, so a re-run only converts new or changed files.
+
+    Kept as JSON in the synced folder, each input path (relative to the folder) maps to its size,
+    mtime and output. A file is up to date if its size and mtime match and its output still exists.
+    """
+
+    name = ".subtotxt-sync.json"
+
+    def __init__(self, folder):
+        """Variables have the following purposes."""
+        self.folder = Path(folder)  # Folder being synced
+        self.path = self.folder / self.name  # The manifest file itself
+        self.files = {}  # Relative input path: [size, mtime_ns, relative output path]
+        with suppress(OSError, ValueError, KeyError):
+            self.files = json.loads(self.path.read_text(encoding="utf_8"))["files"]
+
+    def walk(self, folder=None):
+        """Yield (relative path, size, mtime_ns) for every subtitle under folder, one stat per file."""
+        with os.scandir(folder or self.folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.walk(entry.path)
+                elif os.path.splitext(entry.name)[1] in suffixes and entry.is_file():
+                    st = entry.stat()
+                    yield Path(entry.path).relative_to(self.folder).as_posix(), st.st_size, st.st_mtime_ns
+
+    def plan(self):
+        """Compare the folder with the manifest, returns (changed {path: [size, mtime]}, deleted paths)."""
+        changed = {}
+        seen = set()
+        for name, size, mtime in self.walk():
+            seen.add(name)
+            old = self.files.get(name)
+            if not old or old[:2] != [size, mtime] or not (self.folder / old[2]).is_file():
+                changed[name] = [size, mtime]
+        return changed, [name for name in self.files if name not in seen]
+
+    def update(self, changed, deleted, failed):
+        """Record converted files, forget deleted and failed ones, then save atomically."""
+        for name in deleted:
+            with suppress(OSError):
+                (self.folder / self.files[name][2]).unlink()
+            del self.files[name]
+        for name, st in changed.items():
+            if name in failed:
+                self.files.pop(name, None)  # Try again next time
+            else:
+                self.files[name] = [*st, Path(name).with_suffix(".txt").as_posix()]
+        tmp = self.path.with_name(f"{self.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": version, "files": self.files}, indent=1), encoding="utf_8")
+        os.replace(tmp, self.path)
+
+
+class watcher:
+    """
+    Snapshots of a folder's subtitles by size and mtime for --watch, each poll finds what to convert.
+
+    Polling needs no OS specific notification API, a poll is one scandir of the folder. A file is only
+    handed over once it has settled, unchanged since the last poll or last modified before it, so one
+    still being copied in isn't converted half written. With --sync sub folders are watched too and
+    the sync manifest is kept up to date, so a restart only converts what changed while stopped.
+    """
+
+    def __init__(self, folder, args):
+        """Variables have the following purposes."""
+        self.folder = Path(folder)  # Folder being watched
+        self.args = args  # Options, for output paths and --copy
+        self.record = manifest(folder) if args.sync else None  # With --sync, its manifest
+        self.seen = {}  # Path: (size, mtime_ns) as of the last poll
+        self.done = {}  # Path: (size, mtime_ns) when last converted (or found up to date)
+        self.last = time.time_ns()  # When the last poll (or this first snapshot) was taken
+        snap = self.snapshot()
+        if self.record:
+            changed, deleted = self.record.plan()
+            self.record.update({}, deleted, set())
+            self.done = {p: st for p, st in snap.items() if self.name(p) not in changed}
+        else:
+            self.done = {p: st for p, st in snap.items() if not self.stale(p, st)}
+
+    def name(self, path):
+        """Return the manifest name of a watched path."""
+        return path.relative_to(self.folder).as_posix()
+
+    def snapshot(self):
+        """Return {path: (size, mtime_ns)} for every subtitle watched, one stat per file."""
+        if self.record:
+            return {self.folder / name: (size, mtime) for name, size, mtime in self.record.walk()}
+        snap = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                stem, suffix = os.path.splitext(entry.name)
+                if self.args.copy and stem.endswith("-copy"):  # Our own outputs
+                    continue
+                if suffix in suffixes and entry.is_file():
+                    st = entry.stat()
+                    snap[Path(entry.path)] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def stale(self, path, st):
+        """Check if an output of path is missing or older than it."""
+        return any(not o.is_file() or o.stat().st_mtime_ns < st[1] for o in output_paths(path, self.args))
+
+    def poll(self):
+        """Take a new snapshot, returns ({settled new or changed path: (size, mtime_ns)}, deleted paths)."""
+        before, self.last = self.last, time.time_ns()
+        now = self.snapshot()
+        settled = (p for p, st in now.items() if self.seen.get(p) == st or st[1] < before)
+        ready = {p: now[p] for p in settled if self.done.get(p) != now[p]}
+        deleted = [p for p in self.done if p not in now]
+        self.seen = now
+        return ready, deleted
+
+    def update(self, ready, deleted, results):
+        """Mark files converted (failed ones too, until they change again) and forget deleted ones."""
+        self.done.update(ready)
+        for p in deleted:
+            del self.done[p]
+        if self.record:
+            failed = {self.name(Path(f)) for f, e, _ in results if e}
+            gone = [n for n in map(self.name, deleted) if n in self.record.files]
+            self.record.update({self.name(p): list(st) for p, st in ready.items()}, gone, failed)
+
+
+class io_threads:
+    """
+    Threads that read inputs ahead and write outputs behind for --prefetch, while this process converts.
+
+    Hides the latency of network shares and slow disks without extra processes, at most limit reads
+    and limit writes are in flight at once.
+    """
+
+    def __init__(self, limit):
+        """Variables have the following purposes."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.limit = max(1, limit)  # Reads ahead and writes behind allowed at once
+        self.pool = ThreadPoolExecutor(max_workers=self.limit)  # Does the reading and writing
+        self.writes = deque()  # (input, future) for writes in flight
+        self.failed = {}  # Input: error, for outputs that could not be written
+
+    def read_ahead(self, files, stream=False):
+        """Yield (file, bytes or None) in order, while the next files are being read."""
+        ahead = deque()
+        for f in files:
+            ahead.append((f, self.pool.submit(fetch, f, stream)))
+            if len(ahead) > self.limit:
+                f, future = ahead.popleft()
+                yield f, future.result()
+        while ahead:
+            f, future = ahead.popleft()
+            yield f, future.result()
+
+    def write(self, file):
+        """Write file.written to file.o in the background, waits first if too many writes are pending."""
+        while len(self.writes) >= self.limit:
+            self.settle()
+        self.writes.append((str(file.i), self.pool.submit(write_bytes, file.o, file.written)))
+
+    def settle(self):
+        """Wait for the oldest write, noting any error against its input."""
+        f, future = self.writes.popleft()
+        try:
+            future.result()
+        except OSError as error:
+            self.failed[f] = str(error)
+
+    def close(self):
+        """Finish all writes and stop the threads, returns {input: error} for failed writes."""
+        while self.writes:
+            self.settle()
+        self.pool.shutdown()
+        return self.failed
+
+
+def fetch(f, stream=False):
+    """Read a whole input for --prefetch, None if it should be memory mapped (or can't be read) instead."""
+    try:
+        with open(f, "rb") as r:
+            return None if stream or os.fstat(r.fileno()).st_size >= mmap_size else r.read()
+    except OSError:
+        return None  # Reported properly when it is loaded again
+
+
+stage_names = ["read", "detect", "decode", "sniff", "parse", "clean", "write"]
+
+
+class stats:
+    """Timings and counts for one file, for --stats."""
+
+    def __init__(self, name):
+        """Variables have the following purposes."""
+        self.name = str(name)  # Input file
+        self.seconds = dict.fromkeys(stage_names, 0.0)  # Wall time per stage
+        self.bytes = 0  # Bytes read
+        self.lines = 0  # Subtitle lines processed
+        self.cues = 0  # Cues the parser gave us
+        self.subs = 0  # Junk regex substitutions
+        self.cached = False  # If True the output came straight from the cache
+
+    def count(self, file, sub):
+        """Collect the counts once the file is done."""
+        self.bytes = file.size
+        self.lines = sub.lines
+        self.subs = sub.subs
+
+    def report(self):
+        """Return a plain dict, parse time is measured inside cleaning so it's taken off that."""
+        seconds = dict(self.seconds)
+        seconds["clean"] = max(0.0, seconds["clean"] - seconds["parse"])
+        return {
+            "file": self.name,
+            "seconds": seconds,
+            "total": sum(seconds.values()),
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "cues": self.cues,
+            "subs": self.subs,
+            "cached": self.cached,
+        }
+
+
+@contextmanager
+def stage(st, name):
+    """Time a block into st.seconds[name], does nothing if st is None."""
+    if st is None:
+        yield
+        return
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        st.seconds[name] += time.perf_counter() - t
+
+
+def timed(cues, st):
+    """Pass cues through, timing the parser and counting cues into st. Returns cues untouched if st is None."""
+    if st is None:
+        return cues
+    return timed_cues(cues, st)
+
+
+def timed_cues(cues, st):
+    """Yield cues, timing how long each one takes to parse."""
+    cues = iter(cues)
+    while True:
+        t = time.perf_counter()
+        c = next(cues, None)
+        st.seconds["parse"] += time.perf_counter() - t
+        if c is None:
+            return
+        st.cues += 1
+        yield c
+
+
+def stats_table(reports):
+    """Print a table of stats reports with a total row."""
+    reports = [r for r in reports if r]
+    if not reports:
+        return
+    total = {"file": "Total", "seconds": dict.fromkeys(stage_names, 0.0), "total": 0.0}
+    for r in reports:
+        for k in stage_names:
+            total["seconds"][k] += r["seconds"][k]
+        for k in ("total", "bytes", "lines", "cues", "subs"):
+            total[k] = total.get(k, 0) + r[k]
+    heads = " ".join(f"{k + ' ms':>10}" for k in stage_names + ["total"])
+    print(f"\n{'file':30} {heads} {'bytes':>11} {'lines':>9} {'cues':>9} {'subs':>9}")
+    for r in reports + [total]:
+        cells = " ".join(f"{r['seconds'][k] * 1000:10.1f}" for k in stage_names)
+        name = Path(r["file"]).name[-30:]
+        print(f"{name:30} {cells} {r['total'] * 1000:10.1f} {r['bytes']:11} {r['lines']:9} {r['cues']:9} {r['subs']:9}")
+    slowest = max(stage_names, key=lambda k: total["seconds"][k])
+    print(f"Slowest stage overall: {slowest} ({total['seconds'][slowest] / (total['total'] or 1) * 100:.0f}%)")
+
+
 def cls():
-    """Clear screen win/*nix friendly."""
-    os.system("cls" if os.name == "nt" else "clear")
+    """Clear screen win/*nix friendly, only on an interactive console. *nix skips starting a shell."""
+    if not sys.stdout.isatty():
+        return
+    if os.name == "nt":
+        os.system("cls")
+    else:
+        print("\033[H\033[2J", end="", flush=True)
 
 
 def yn(yn):
@@ -207,6 +924,8 @@ def yn(yn):
 
 def arguments():
     """Everyone loves arguments, here's a list of them."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         formatter_class=argparse.RawDescriptionHelpFormatter,
         description="Quickly convert SRT, SSA or WEBVTT subtitles into plain text file.",
@@ -267,6 +986,14 @@ def arguments():
         required=False,
         help="Skips asking for permission to overwrite, will auto-delete old file and create a new one",
     )
+    parser.add_argument(
+        "--replace",
+        "-r",
+        default=False,
+        action="store_true",
+        required=False,
+        help="Replace existing output files in place instead of sending them to the trash, best for servers.",
+    )
     parser.add_argument(
         "--oneliners",
         "-1",
@@ -291,6 +1018,139 @@ def arguments():
         required=False,
         help="For SubStation Alpha (.ssa/.ass), do not sort by timecode.",
     )
+    parser.add_argument(
+        "--sync",
+        "-sy",
+        default=False,
+        action="store_true",
+        required=False,
+        help="For --dir mode, include sub folders, only convert new or changed files, remove outputs of deleted ones.",
+    )
+    parser.add_argument(
+        "--watch",
+        "-wa",
+        type=float,
+        nargs="?",
+        const=watch_interval,
+        default=0,
+        required=False,
+        help=f"For --dir mode, keep running and convert new or changed files as they arrive, checking every "
+        f"this many seconds (default {watch_interval}).",
+    )
+    parser.add_argument(
+        "--dedup",
+        "-dd",
+        type=int,
+        default=0,
+        required=False,
+        help="Drop lines repeated within this many lines and text repeated from the line before, for live captions.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        required=False,
+        help="For --dir mode, number of files to convert in parallel worker processes (0 = one per CPU core).",
+    )
+    parser.add_argument(
+        "--prefetch",
+        "-pf",
+        type=int,
+        default=0,
+        required=False,
+        help="For --dir mode with one job, read this many files ahead and write outputs in the background on threads.",
+    )
+    parser.add_argument(
+        "--outputs",
+        "-op",
+        type=str,
+        default=None,
+        required=False,
+        help="Write several versions from one read, e.g. plain,nonames,nonames+oneliners (also nosort, utf8).",
+    )
+    parser.add_argument(
+        "--stream",
+        "-st",
+        default=False,
+        action="store_true",
+        required=False,
+        help="Convert line by line straight to the output, memory stays flat for huge files. -f - for stdin/stdout.",
+    )
+    parser.add_argument(
+        "--window",
+        "-w",
+        type=int,
+        default=1000,
+        required=False,
+        help="For --stream, how many .ssa/.ass lines to hold at once when sorting by timecode.",
+    )
+    parser.add_argument(
+        "--detect",
+        "-dt",
+        choices=["fast", "full"],
+        default="fast",
+        required=False,
+        help="Encoding detection, fast: BOM/UTF-8 check first, full: always use charset_normalizer on the whole file.",
+    )
+    parser.add_argument(
+        "--format",
+        "-fm",
+        choices=["srt", "vtt", "ass", "ssa"],
+        default=None,
+        required=False,
+        help="Skip format detection and treat the input as this subtitle format.",
+    )
+    parser.add_argument(
+        "--stats",
+        "-sa",
+        default=False,
+        action="store_true",
+        required=False,
+        help="Show time taken by each stage plus bytes, lines, cues and junk removed for each file.",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        required=False,
+        help="Save --stats as JSON to this file (turns on --stats).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        required=False,
+        help="Save cProfile output to this file, view with `python -m pstats`. Profiles this process only.",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        required=False,
+        help="Folder to cache conversions in, unchanged files are then served from the cache on later runs.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        required=False,
+        help="Size of --cache in MB, least recently used entries are removed beyond this.",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=512,
+        required=False,
+        help="Refuse input files bigger than this many MB, 0 for no limit.",
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=1024,
+        required=False,
+        help="Convert files that would need more than this many MB of memory a chunk at a time, 0 to switch off.",
+    )
     parser.add_argument(
         "--debug",
         "-db",
@@ -302,83 +1162,255 @@ def arguments():
     return parser.parse_args()
 
 
-def overwrite_old_file(f):
-    """Politely check if there is an exiting file before moving forward."""
+def overwrite_old_file(f, file):
+    """
+    Politely check if there is an exiting file before moving forward.
+
+    The old file goes to the trash now, or with --replace is swapped for the new one once it is written.
+    """
     if f.is_file():
         if (not file.overw and yn("Output file already exists, delete and make a new one?")) or file.overw:
             print("Overwriting old file")
-            send2trash(f)
+            if file.trash:
+                need("send2trash", "send2trash").send2trash(f)
         else:
             raise Exception("Output file already exists.")
 
 
-def copy():
-    """For testing encoding errors, copies file line by line but does not process the subtitles."""
-    overwrite_old_file(file.c)
-    with open(file.i, "r", encoding=enc.enc) as original, open(file.c, "w", encoding=enc.out) as new:
-        for line in original:
-            if args.screen:
-                print(line, end="")
-            new.write(line)
+@contextmanager
+def atomic_write(target, mode="w", encoding=None):
+    """
+    Open a temporary file next to target with a large buffer, it replaces target in one step once written.
+
+    Readers see the old file or the new one, never half of one, and a failed write leaves target alone.
+    """
+    target = Path(target)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, mode, buffering=write_buffer, encoding=encoding) as new:
+            yield new
+        os.replace(tmp, target)
+    except BaseException:
+        with suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+def write_bytes(target, data):
+    """Write already encoded output to target atomically."""
+    with atomic_write(target, "wb") as new:
+        new.write(data)
+
+
+def same_encoding(a, b):
+    """Return True if text in encoding a is already valid, unchanged, in encoding b."""
+    a, b = codecs.lookup(a).name, codecs.lookup(b).name
+    return a == b or (a == "ascii" and b == "utf-8")
+
+
+def copy(file, enc, sub):
+    """
+    For testing encoding errors, copies the input without processing the subtitles.
+
+    If the output encoding matches the input the bytes are copied as they are, otherwise they are
+    transcoded a block at a time so memory use stays flat. Line endings are left as they are.
+    """
+    overwrite_old_file(file.c, file)
+    view = memoryview(file.data)
+    try:
+        with atomic_write(file.c, "wb") as new:
+            if same_encoding(enc.enc, enc.out) and not sub.scr:
+                new.write(view)
+            else:
+                decoder = codecs.getincrementaldecoder(enc.enc)()
+                encoder = codecs.getincrementalencoder(enc.out)()
+                for n in range(0, len(view), copy_block):
+                    end = n + copy_block
+                    text = decoder.decode(view[n:end])
+                    if sub.scr:
+                        print(text, end="")
+                    new.write(encoder.encode(text))
+                new.write(encoder.encode(decoder.decode(b"", final=True), final=True))
+    finally:
+        view.release()
     print(f"Output file: {file.c}")
 
 
-def junk_strip(line):
-    """Based on PR #4 by eMPee584. Looping is terrible, but, a required evil it seems."""
-    if sub.junk:
-        for junk in sub.junk:
-            try:
-                line = re.sub(rf"{junk}", "", line)
-            except Exception:  # Line may become blank if we remove Closed Captions
-                pass
+@lru_cache(maxsize=None)
+def compile_junk(junklist):
+    """Compile a junk list once per option set, returns ((trigger, pattern), ...) in the same order."""
+    return tuple((trigger, re.compile(junk)) for trigger, junk in junklist)
+
+
+def junk_strip(line, sub):
+    """
+    Based on PR #4 by eMPee584.
+
+    Patterns run in order, each one only if its trigger character is in the line.
+    Removing text can never add a trigger, so checking as we go is safe.
+    """
+    for trigger, junk in sub.junk:
+        if trigger in line:
+            line, n = junk.subn("", line)
+            sub.subs += n
     return line
 
 
-def process_line(line):
+def overlap(prev, line):
+    """
+    Return how many characters at the start of line repeat the end of prev, 0 if it's not worth trimming.
+
+    All of prev (a growing caption) counts, otherwise the repeat must be at least three whole words.
+    """
+    if not prev:
+        return 0
+    if line.startswith(prev) and (len(line) == len(prev) or line[len(prev)] == " "):
+        return len(prev)
+    word = f" {line.partition(' ')[0]} "  # Only places where line's first word comes up can match
+    n = prev.find(word)
+    while n != -1:
+        n += 1
+        tail = prev[n:]
+        if tail.count(" ") < 2:
+            return 0
+        if line.startswith(tail) and (len(line) == len(tail) or line[len(tail)] == " "):
+            return len(tail)
+        n = prev.find(word, n)
+    return 0
+
+
+def dedup(line, sub):
+    """
+    For --dedup, return line with any repeat of the previous line trimmed, or "" if it's been seen lately.
+
+    Rolling live captions repeat each line for a few cues and often start with the end of what came before.
+    Recent lines are kept in a window of sub.dedup lines and overlaps are only looked for in the last
+    dedup_tail characters, so every check is O(1) however long the file.
+    """
+    if line in sub.seen:
+        return ""
+    trim = max(overlap(sub.tail, line), overlap(sub.kept, line))
+    sub.recent.append(line)
+    sub.seen.add(line)
+    if len(sub.recent) > sub.dedup:
+        sub.seen.discard(sub.recent.popleft())
+    kept = line[trim:].lstrip()
+    if kept:
+        sub.kept = kept
+        sub.tail = f"{sub.tail} {kept}"[-dedup_tail:].lstrip()
+    return kept
+
+
+# Sentence ending punctuation for --oneliners, Latin, CJK full and half width, Arabic, Urdu, Devanagari, Ethiopic...
+sentence_ends = frozenset(".?!…‼⁇⁈⁉。？！．｡︒﹒﹖﹗؟۔।॥።፧᙮꓿")
+closers = "\"'”’»›)]}」』）］｝】〕〗〙〛〉》＂＇"  # May follow the punctuation, e.g. `"Really?"` or `（笑。）`
+
+
+def ends_sentence(line):
+    """Return True if line finishes a sentence, looking past any closing quotes or brackets."""
+    end = line.rstrip(closers)
+    return bool(end) and end[-1] in sentence_ends
+
+
+def join_sentences(lines):
+    """
+    Join cleaned lines into one line per sentence for --oneliners, one join per output line.
+
+    Works on a whole list or any iterable (yielding as it goes, for --stream), an unfinished sentence at the
+    end is yielded as it is.
+    """
+    sentence = []
+    for line in lines:
+        sentence.append(line)
+        if ends_sentence(line):
+            yield " ".join(sentence)
+            sentence.clear()
+    if sentence:
+        yield " ".join(sentence)
+
+
+def process_line(line, sub):
     """Process each line, remove formatting junk, check for duplicates, store for writing later."""
+    sub.lines += 1
     # Strip formatting junk from line
     # We do this before checking for duplicates
-    line = junk_strip(line).strip()
+    line = junk_strip(line, sub).strip()
+    if sub.dedup and line:
+        line = dedup(line, sub)
     # Process line if it's not a duplicate of the previous one, or empty.
     # Based on PR #4 by eMPee584
     # Fix for live translations giving duplicates from Issue #9 by rajibando
-    if line.strip() and line.strip() != sub.prev.strip():
-        # One liners based on PR #2 by adam-sierakowski
-        if sub.oneline:
-            if line[-1] in [".", "?", "!", "…"]:
-                ln = f"{line}\n"
-                sub.text += ln
-            else:
-                ln = f"{line} "
-                sub.text += ln
-        else:
-            ln = f"{line}\n"
-            sub.text += ln
-
+    if line and line != sub.prev:
+        sub.text.append(line)
         if sub.scr:
-            print(ln, end="")
-        sub.prev = ln
+            # One liners based on PR #2 by adam-sierakowski, joined on output by join_sentences()
+            print(line, end=" " if sub.oneline and not ends_sentence(line) else "\n")
+        sub.prev = line
 
 
-def do_srt():
+def cue_blocks(original, vtt=False):
+    """
+    Yield a cue for each block of a .srt/.vtt file, one pass over the lines with no lookahead.
+
+    A block is an optional identifier, a timecode line and the text, ended by a blank line or the next
+    timecode. A possible identifier (any number, or a block's first line for .vtt) is held for one line, it
+    only is one if a timecode follows. So numbers can be missing, repeated or out of order, blank lines
+    between blocks can be missing and number only text is kept.
+    For .vtt the header before the first timecode and NOTE/STYLE/REGION blocks are skipped.
+    """
+    start = end = 0
+    text = []
+    held = None  # First line of a block, an identifier if a timecode comes next
+    body = not vtt  # False while in a .vtt header or NOTE/STYLE/REGION block
+    first = True  # Next line starts a block
+    for line in original:
+        line = line.rstrip("\n")
+        tc = timecode_re.match(line.lstrip()) if "-->" in line else None
+        if tc:
+            if text:
+                yield cue(start, end, "\n".join(text))
+                text = []
+            start, end = ms(*tc.group(1, 2, 3, 5)), ms(*tc.group(6, 7, 8, 9))
+            held = None
+            body = True
+            first = False
+            continue
+        if held is not None:  # No timecode after it, so it was text
+            if body:
+                text.append(held)
+            held = None
+        if not line:
+            if text:  # Blank line ends the block
+                yield cue(start, end, "\n".join(text))
+                text = []
+            first = True
+            continue
+        if first and vtt and line.startswith(("NOTE", "STYLE", "REGION")):
+            body = False
+        elif (first and vtt) or line.strip().isdigit():
+            held = line
+        elif body:
+            text.append(line)
+        first = False
+    if held is not None and body:
+        text.append(held)
+    if text:
+        yield cue(start, end, "\n".join(text))
+
+
+def do_srt(original, sub):  # noqa: U100
     """
     Format: .srt SubRip.
 
     https://en.wikipedia.org/wiki/SubRip
     Format has a line number followed by a timecode on the next line, then text.
+    Yields a cue for each block of text.
     """
     print("Processing file as SubRip subtitles [.srt]")
-    with open(file.i, "r", encoding=enc.enc) as original:
-        subnum = 1
-        for line in original:  # Ignore SRT Subtitle # and Timecode lines
-            if line.strip("\n") == str(subnum) and re.search("(.*:.*:.*-->.*:.*:.*)", next(original)):
-                subnum += 1
-            elif not line.strip("\n") == "":
-                process_line(line)
-    write_to_file()
+    yield from cue_blocks(original)
 
 
-def do_vtt():
+def do_vtt(original, sub):  # noqa: U100
     """
     Format: .vtt WebVTT (Web Video Text Tracks).
 
@@ -387,25 +1419,13 @@ def do_vtt():
     This format has a few differing `standards`, you have:
     Metadata, notes, styles, timceodes with optional hours, and optional line numbers,
     almost none of which are actually used it seems. But we need to handle them.
+    Yields a cue for each block of text.
     """
     print("Processing file as WebVTT (Web Video Text Tracks) [.vtt]")
-    with open(file.i, "r", encoding=enc.enc) as original:
-        subnum = 1
-        head = 1  # Try and skip over everything until we reach the subtitles.
-        for line in original:
-            # Line number and timecode format
-            if line.strip("\n") == str(subnum) and re.search("(.*:.*-->.*:.*)", next(original)):
-                subnum += 1
-                head = 0
-            # Timecode only format
-            elif re.search("(.*:.*-->.*:.*)", line):
-                head = 0
-            elif not line.strip("\n") == "" and head == 0:
-                process_line(line)
-    write_to_file()
-
-
-def do_ass():
+    yield from cue_blocks(original, vtt=True)
+
+
+def do_ass(original, sub):
     """
     Format: .ssa/.ass SubStation Alpha.
 
@@ -415,127 +1435,702 @@ def do_ass():
     this should not be a big problem as the text is always on a `Dialog:` line.
     Two keys issues are; lines may not be in timecode order,
     text may be for labelling objects and not part of the script.
+    Yields a cue for each dialogue line, sorted by start time unless sub.nosrt, lines starting at the
+    same time keep their file order. In --stream mode (sub.window) only sub.window lines are held for
+    sorting, good enough unless the file is badly out of order.
     """
     print("Processing file as SubStation Alpha subtitle [.ssa/.ass]")
-    with open(file.i, "r", encoding=enc.enc) as original:
-        # Try and get version
-        fv = ""
-        for line in original:
-            if "ScriptType:" in line:
-                fv = line.split(": ")[1].strip()
-        print(f"SSA Version: {fv}" if fv != "" else "No version found, assuming v1.0")
-        original.seek(0)
-        d = {}
-        for line in original:
-            # Example Dialog line v1.0:
-            # Dialogue: Marked=0,0:01:16.0,0:01:23.4,White Text,Usagi,0000,0000,0000,Pretty Soldier Sailor Moon
-            # Example Dialog line v3+:
-            # Dialogue: Marked=0,0:01:38.95,0:01:41.75,owari,Lupin,0000,0000,0000,,Yeah, love is wonderful.
-            if "Dialogue:" in line:
-                if fv == "":
-                    x = re.findall(r"Dialogue:.*?,(.*?\.\d*),.*?\.\d*,.*?,(.*?),.*?,.*?,.*?,(.*)", line)  # v1.0
-                else:
-                    x = re.findall(r"Dialogue:.*?,(.*?\.\d*),.*?\.\d*,(.*?),.*?,.*?,.*?,.*?,.*?,(.*)", line)  # v 3.0+
-                stc = x[0][0]  # Start timecode
-                nom = x[0][1]  # Character speaking
-                txt = x[0][2]  # Text
-                text = txt if (sub.no_names or nom == "") else f"{nom}: {txt}"
-                d.update({stc: {"dialog": text}})
-        for t in [v["dialog"] for k, v in sorted(d.items())] if not sub.nosrt else [v["dialog"] for v in d.values()]:
-            process_line(t.replace(r"\n", " ").replace(r"\N", " "))  # Fixes odd newline in .ass
-    write_to_file()
-
-
-def write_to_file():
-    """Write completed text to a new file."""
-    with open(file.o, "w", encoding=enc.out) as new:
-        # We check for junk again because it can gets split over two lines and we can't find it until now.
-        for line in sub.text.splitlines():
-            sub.text_finished += f"{junk_strip(line)}\n"
-        new.write(sub.text_finished)
-
-
-def do_work():
-    """Process file based on sub.format, additionally check if there is a file from a previous run."""
-    overwrite_old_file(file.o)
+    # Try and get version, ScriptType lives in [Script Info] before any Dialogue lines
+    fv = ""
+    events = False  # In the [Events] section, where the Format: line for Dialogue lines is
+    fields = None  # Column positions from the Format: line
+    cues = []
+    held = []  # Heap of (start, line number, cue) for --stream mode
+    for n, line in enumerate(original):
+        # Example Dialog line v1.0:
+        # Dialogue: Marked=0,0:01:16.0,0:01:23.4,White Text,Usagi,0000,0000,0000,Pretty Soldier Sailor Moon
+        # Example Dialog line v3+:
+        # Dialogue: Marked=0,0:01:38.95,0:01:41.75,owari,Lupin,0000,0000,0000,,Yeah, love is wonderful.
+        if line.startswith("Dialogue:"):
+            if fields is None:  # No Format: line, go by version
+                fields = ass_fields(ass_columns[bool(fv)])
+            count, s, e, nm = fields
+            x = line[9:].split(",", count - 1)  # Text is last and may have commas, so only split off the rest
+            if len(x) < count:
+                continue  # Too few columns to hold a subtitle
+            nom = x[nm].strip() if nm is not None else ""  # Character speaking
+            c = cue(ass_time(x[s]), ass_time(x[e]), ass_newlines(x[-1].rstrip("\n")), nom)
+            if sub.nosrt and sub.window:
+                yield c
+            elif sub.window:
+                heappush(held, (c.start, n, c))
+                if len(held) > sub.window:
+                    yield heappop(held)[2]
+            else:
+                cues.append(c)
+        elif line.startswith("["):
+            events = line.strip().lower() == "[events]"
+        elif events and line.startswith("Format:"):
+            fields = ass_fields([column.strip().lower() for column in line[7:].split(",")])
+        elif line.startswith("ScriptType:"):
+            fv = line.split(":", 1)[1].strip()
+            print(f"SSA Version: {fv}")
+    if not fv:
+        print("No version found, assuming v1.0")
+    while held:
+        yield heappop(held)[2]
+    if not sub.nosrt:
+        cues.sort(key=lambda c: c.start)  # Stable, so equal start times stay in file order
+    yield from cues
+
+
+# Dialogue columns to use if there's no [Events] Format: line, by whether a ScriptType was found
+ass_columns = {
+    False: ["marked", "start", "end", "style", "name", "marginl", "marginr", "marginv", "text"],  # v1.0
+    True: ["layer", "start", "end", "style", "name", "marginl", "marginr", "marginv", "effect", "text"],  # v3.0+
+}
+
+
+def ass_fields(columns):
+    """
+    Return (number of columns, start, end, name) positions from Dialogue column names, text is always last.
+
+    name is None if there's no Name (or older Actor) column, unusable columns fall back to the v3.0+ ones.
+    """
+    if "start" not in columns or "end" not in columns or columns[-1] != "text":
+        columns = ass_columns[True]
+    name = next((columns.index(c) for c in ("name", "actor") if c in columns), None)
+    return len(columns), columns.index("start"), columns.index("end"), name
+
+
+def ass_newlines(t):
+    """Fix odd newline in .ass."""
+    return t.replace(r"\n", " ").replace(r"\N", " ")
+
+
+def handler(sub):
+    """Return the handler for sub.format."""
     if sub.format == "srt":
-        do_srt()
+        return do_srt
     elif sub.format == "vtt":
-        do_vtt()
+        return do_vtt
     elif sub.format == "ass":
-        do_ass()
+        return do_ass
     else:
         raise Exception("Unable to determine Subtitle format.")
 
 
+class replay(io.RawIOBase):
+    """Binary stream that gives back the stdin sample already read for detection, then the rest of stdin."""
+
+    def __init__(self, head, rest):
+        """Variables have the following purposes."""
+        self.head = head  # Bytes already read
+        self.rest = rest  # Stream to carry on with
+        self.total = 0  # Bytes given out so far
+
+    def readable(self):
+        """Report the stream as readable."""
+        return True
+
+    def readinto(self, b):
+        """Fill b from the sample first, then the stream."""
+        if self.head:
+            n = min(len(b), len(self.head))
+            b[:n] = self.head[:n]
+            self.head = self.head[n:]
+            self.total += n
+            return n
+        data = self.rest.read1(len(b)) if hasattr(self.rest, "read1") else self.rest.read(len(b))
+        b[: len(data)] = data
+        self.total += len(data)
+        return len(data)
+
+
+replaced = [0]  # Bytes of stdin that didn't fit the detected encoding, see stdin_errors()
+
+
+def stdin_errors(error):
+    """Decode error handler for stdin, whose encoding is only a guess from the start: replace and count."""
+    replaced[0] += error.end - error.start
+    return "\ufffd", error.end
+
+
+codecs.register_error("subtotxt_stdin", stdin_errors)
+
+
+@contextmanager
+def open_input(file, enc):
+    """
+    Line view of the input, nothing is read from disk again.
+
+    Decoded text is rewound and shared, otherwise (--stream, stdin) the raw bytes are decoded as we go.
+    stdin can't be checked ahead, so bytes that don't fit its encoding are replaced with a warning rather
+    than stopping with the output half written.
+    """
+    if file.text is not None:
+        file.text.seek(0)
+        yield file.text
+        return
+    view = memoryview(file.data)
+    raw = replay(view, sys.stdin.buffer if file.pipe else io.BytesIO())
+    errors = "subtotxt_stdin" if file.pipe else "strict"
+    original = io.TextIOWrapper(io.BufferedReader(raw), encoding=enc.enc, errors=errors)
+    before = replaced[0]
+    try:
+        yield original
+    finally:
+        original.close()
+        view.release()
+        if file.pipe:
+            file.size = raw.total
+            if replaced[0] > before:
+                print(f"Warning: {replaced[0] - before} bytes of stdin weren't valid {enc.enc}, replaced with \ufffd")
+
+
+@contextmanager
+def open_output(file, enc):
+    """Open the output for writing, a file or stdout. stdout is left open for the rest of the script."""
+    if not file.pipe:
+        with atomic_write(file.o, encoding=enc.out) as new:
+            yield new
+        return
+    new = io.TextIOWrapper(sys.__stdout__.buffer, encoding=enc.out)
+    try:
+        yield new
+    finally:
+        new.flush()
+        new.detach()
+
+
+def cue_lines(cues, names=True):
+    """Yield each line of text from cues, starting with the character's name (if known) when names is True."""
+    for c in cues:
+        yield from (f"{c.name}: {c.text}" if names and c.name else c.text).split("\n")
+
+
+def finish(texts, sub):
+    """Run a final pass over collected text, yields each finished output line."""
+    # We check for junk again because it can gets split over two lines and we can't find it until now.
+    for text in texts:
+        for line in text.splitlines():
+            yield f"{junk_strip(line, sub)}\n"
+
+
+def finished_lines(sub):
+    """Finish everything collected in sub."""
+    return finish(sub.output(), sub)
+
+
+def finish_text(sub):
+    """Return the finished output as one string."""
+    return "".join(finished_lines(sub))
+
+
+def write_to_file(file, enc, sub):
+    """Write completed text to a new file, lines go straight to the buffered file without joining."""
+    if file.writer:  # Only encode here, the write itself happens in the background
+        text = finish_text(sub)
+        file.written = (text if os.linesep == "\n" else text.replace("\n", os.linesep)).encode(enc.out)
+        file.writer.write(file)
+        return
+    with open_output(file, enc) as new:
+        new.writelines(finished_lines(sub))
+
+
+def parse(file, enc, sub):
+    """Run the subtitle through the handler for sub.format, collecting the text in sub."""
+    lines = handler(sub)
+    with stage(sub.stats, "clean"), open_input(file, enc) as original:
+        for line in cue_lines(timed(lines(original, sub), sub.stats), not sub.no_names):
+            process_line(line, sub)
+
+
+def stream_lines(lines, sub):
+    """Pipe subtitle lines in and finished output lines out, only the current line (or sentence) is held."""
+
+    def cleaned():
+        for line in lines:
+            process_line(line, sub)
+            yield from sub.text
+            sub.text.clear()
+
+    yield from finish(sub.output(cleaned()), sub)
+
+
+def do_work(file, enc, sub):
+    """Process file based on sub.format, additionally check if there is a file from a previous run."""
+    if not file.pipe:
+        overwrite_old_file(file.o, file)
+    if sub.window:  # --stream, writing is counted as part of cleaning
+        lines = handler(sub)
+        with stage(sub.stats, "clean"), open_input(file, enc) as original, open_output(file, enc) as new:
+            cues = timed(lines(original, sub), sub.stats)
+            new.writelines(stream_lines(cue_lines(cues, not sub.no_names), sub))
+    else:
+        parse(file, enc, sub)
+        with stage(sub.stats, "write"):
+            write_to_file(file, enc, sub)
+    if sub.stats:
+        sub.stats.count(file, sub)
+
+
+def prepare(path, opts, st=None, data=None):
+    """
+    Set up fresh file/enc/sub state for one conversion, nothing is shared between calls.
+
+    data is the input already read (by --prefetch), if None it is loaded here.
+    """
+    file = file_handler()
+    enc = encoding()
+    sub = subtitle()
+    sub.stats = st
+    file.set_file(path)
+    file.set_over(opts.overwrite)
+    file.set_replace(opts.replace)
+    with stage(st, "read"):
+        file.load(opts.stream, opts.max_size << 20, 0 if opts.outputs else opts.memory << 20, data)
+    if looks_binary(file.data[:binary_sample]):
+        raise Exception("Input looks like binary data (a video renamed?), not a subtitle.")
+    stream = opts.stream or file.chunked
+    info = None
+    if opts.cache and not file.pipe:
+        file.key = opts.cache.remember(file.i, file.data, opts)
+        info = opts.cache.get(file.key)[0]
+    with stage(st, "detect"):
+        if info:
+            enc.enc = info["enc"]
+            print(f"Character Encoding from cache: {enc.enc}")
+        else:
+            enc.check_encoding(file.data, opts.detect, partial=file.pipe, keep=not stream)
+    if not (stream or file.pipe):
+        with stage(st, "decode"):
+            file.decode(enc)
+    enc.force_utf8(opts.utf8)  # True/False
+    sub.set_no_names(opts.nonames)  # True/False
+    sub.set_no_sort(opts.nosort)  # True/False
+    sub.screen_output(opts.screen)  # True/False
+    sub.one_line(opts.oneliners)  # True/False
+    sub.set_dedup(opts.dedup)
+    sub.window = max(1, opts.window) if stream or file.pipe else 0
+    if opts.format:
+        sub.format = "ass" if opts.format == "ssa" else opts.format
+        print(f"Subtitle format set to: {sub.format}")
+    elif info:
+        sub.format = info["format"]
+    else:
+        with stage(st, "sniff"):
+            sub.testsub(file, enc)
+    return file, enc, sub
+
+
+def prepare_copy(path, opts, st=None, data=None):
+    """
+    Set up file/enc/sub state for --copy, the input is only mapped and its encoding detected.
+
+    data is the input already read (by --prefetch), if None it is mapped here.
+    """
+    file = file_handler()
+    enc = encoding()
+    sub = subtitle()
+    file.set_file(path)
+    file.set_over(opts.overwrite)
+    file.set_replace(opts.replace)
+    with stage(st, "read"):
+        file.load(stream=True, max_size=opts.max_size << 20, data=data)
+    if looks_binary(file.data[:binary_sample]):
+        raise Exception("Input looks like binary data (a video renamed?), not a subtitle.")
+    with stage(st, "detect"):
+        enc.check_encoding(file.data, opts.detect, keep=False)
+    enc.force_utf8(opts.utf8)  # True/False
+    sub.screen_output(opts.screen)  # True/False
+    return file, enc, sub
+
+
+def copy_file(path, opts=None, st=None, data=None):
+    """
+    Copy a subtitle file without processing it to <name>-copy, changing its encoding with utf8.
+
+    Returns the copy's path, safe to call from several threads at once. data is the input if already read.
+    """
+    file, enc, sub = prepare_copy(path, opts or options(), st, data)
+    with stage(st, "write"):
+        copy(file, enc, sub)
+    if st:
+        st.count(file, sub)
+    return file.c
+
+
+variant_names = ("nonames", "oneliners", "nosort", "utf8")  # What --outputs can mix, in file name order
+
+
+def variants(spec):
+    """Read an --outputs list like "plain,nonames,nonames+oneliners", returns each as a set of variant names."""
+    found = []
+    for item in spec.split(","):
+        v = frozenset(x.strip().lower() for x in item.split("+")) - {"plain", ""}
+        if v - set(variant_names):
+            raise Exception(f"Unknown --outputs variant '{item}', use plain or a mix of {', '.join(variant_names)}.")
+        if v not in found:
+            found.append(v)
+    return found
+
+
+def variant_path(o, v):
+    """Output path for variant v of output o, e.g. subtitle-nonames-oneliners.txt, plain keeps o."""
+    return o.with_stem("-".join([o.stem, *(x for x in variant_names if x in v)]))
+
+
+def output_paths(f, opts):
+    """Every output path a batch will write for input f."""
+    if opts.copy:
+        return [f.with_stem(f"{f.stem}-copy")]
+    if opts.outputs:
+        return [variant_path(f.with_suffix(".txt"), v) for v in variants(opts.outputs)]
+    return [f.with_suffix(".txt")]
+
+
+def do_outputs(file, enc, sub, spec, opts):
+    """
+    Write several variants of one subtitle (see variants()) from a single read, detection and parse.
+
+    The options in opts apply to every variant, each adds its own on top. Cues are parsed once in file
+    order and sorted once if needed, variants only differing by encoding share the cleaned text.
+    Returns the output paths.
+    """
+    wanted = variants(spec)
+    st = sub.stats
+    if file.pipe or sub.window:
+        raise Exception("--outputs needs a file and can't be used with --stream.")
+    sub.set_no_sort(True)
+    with stage(st, "clean"), stage(st, "parse"), open_input(file, enc) as original:  # As in parse(), see report()
+        cues = list(handler(sub)(original, sub))
+    if st:
+        st.cues = len(cues)
+    ordered = None
+    done = {}  # (nonames, oneliners, nosort): finished lines
+    paths = []
+    for v in wanted:
+        nonames, oneliners = opts.nonames or "nonames" in v, opts.oneliners or "oneliners" in v
+        nosort = opts.nosort or "nosort" in v or sub.format != "ass"
+        key = (nonames, oneliners, nosort)
+        if key not in done:
+            if not nosort and ordered is None:
+                ordered = sorted(cues, key=lambda c: c.start)  # Stable, so equal start times stay in file order
+            vsub = subtitle()
+            vsub.set_no_names(nonames)
+            vsub.one_line(oneliners)
+            vsub.set_dedup(opts.dedup)
+            with stage(st, "clean"):
+                for line in cue_lines(cues if nosort else ordered, not nonames):
+                    process_line(line, vsub)
+                done[key] = list(finished_lines(vsub))
+            if st:
+                st.lines += vsub.lines
+                st.subs += vsub.subs
+        out = file_handler()
+        out.o, out.overw, out.trash = variant_path(file.o, v), file.overw, file.trash
+        venc = encoding()
+        venc.out = "utf_8" if opts.utf8 or "utf8" in v else enc.enc
+        overwrite_old_file(out.o, out)
+        with stage(st, "write"), atomic_write(out.o, encoding=venc.out) as new:
+            new.writelines(done[key])
+        print(f"Output file: {out.o}")
+        paths.append(out.o)
+    if st:
+        st.bytes = file.size
+    return paths
+
+
+def convert_outputs(path, spec, opts=None, st=None, data=None):
+    """
+    Convert a subtitle file into several variants at once, spec lists them as for --outputs.
+
+    Returns the output paths, safe to call from several threads at once. data is the input if already read.
+    """
+    opts = opts or options()
+    file, enc, sub = prepare(path, opts, st, data)
+    return do_outputs(file, enc, sub, spec, opts)
+
+
+def convert(source, opts=None):
+    """
+    Convert a subtitle file and return the plain text, nothing is written to disk.
+
+    Usage: convert("subtitle.srt", options(nonames=True))
+    Safe to call from several threads at once, every call has its own state.
+    """
+    file, enc, sub = prepare(source, opts or options())
+    parse(file, enc, sub)
+    return finish_text(sub)
+
+
+def convert_file(path, dest=None, opts=None, st=None, data=None, writer=None):
+    """
+    Convert a subtitle file and write the plain text to dest (default: input name with .txt).
+
+    Returns the output path. Safe to call from several threads at once.
+    Pass a stats object as st to have it filled in, data if the input is already read and an
+    io_threads pool as writer to have the output written in the background.
+    """
+    opts = opts or options()
+    if opts.cache and str(path) != "-":
+        key = opts.cache.known(path, opts)
+        info, text = opts.cache.get(key) if key else (None, None)
+        if text:  # Unchanged since last time, nothing to read or convert
+            file = file_handler()
+            file.set_file(path)
+            file.set_over(opts.overwrite)
+            file.set_replace(opts.replace)
+            file.o = Path(dest) if dest is not None else file.o
+            overwrite_old_file(file.o, file)
+            with open(text, "rb") as cached, atomic_write(file.o, "wb") as new:
+                shutil.copyfileobj(cached, new)
+            print(f"Output from cache: {file.o}")
+            if st:
+                st.cached = True
+                st.bytes = 0
+            return file.o
+    file, enc, sub = prepare(path, opts, st, data)
+    if dest is not None:
+        file.o = Path(dest)
+    file.writer = writer
+    do_work(file, enc, sub)
+    if file.key:
+        opts.cache.put(file.key, {"enc": enc.enc, "format": sub.format}, file.written or file.o)
+    return file.o
+
+
 def check_it_works(in_file):  # Pytest runner
     """For pytest runs, sets variables."""
     try:
-        file.set_file(in_file["test_file"])
-        file.o = Path(in_file["test_outf"])  # Override normal output file
-        file.set_over(True)  # Always overwrite (although unlikely when Pytesting)
-        enc.check_encoding()
-        enc.force_utf8(in_file["test_force"])  # True/False
-        sub.set_no_names(in_file["test_names"])  # True/False
-        sub.set_no_sort(in_file["test_sort"])
-        sub.screen_output(False)  # Pytest never needs to output to screen
-        sub.one_line(in_file["test_onel"])
-        sub.testsub()
-        do_work()
+        opts = options(
+            utf8=in_file["test_force"],  # True/False
+            nonames=in_file["test_names"],  # True/False
+            nosort=in_file["test_sort"],
+            oneliners=in_file["test_onel"],
+            screen=False,  # Pytest never needs to output to screen
+            overwrite=True,  # Always overwrite (although unlikely when Pytesting)
+        )
+        convert_file(in_file["test_file"], in_file["test_outf"], opts)  # Override normal output file
         return
     except Exception as error:
         return f"Testing failed: {error}"
 
 
-# Init classes
-file = file_handler()
-enc = encoding()
-sub = subtitle()
+def batch_worker(f, args, data=None, writer=None):
+    """
+    Convert a single file for --dir mode, returns (file, error, stats report).
+
+    error is None on success, the report is None without --stats.
+    convert_file() gives each call fresh state, so nothing carries over between files and
+    it's safe to run in a worker process.
+    """
+    st = stats(f) if args.stats else None
+    try:
+        if args.copy:
+            copy_file(f, args, st, data)
+        elif args.outputs:
+            convert_outputs(f, args.outputs, args, st, data)
+        else:
+            convert_file(f, opts=args, st=st, data=data, writer=writer)
+        print("-" * 22)
+        return str(f), None, st and st.report()
+    except Exception as error:
+        print(f"Failed: {f}\n{error}\n{'-' * 22}")
+        return str(f), str(error), st and st.report()
+
+
+def run_batch(files, args, pool=None):
+    """
+    Convert a list of files, serially or spread over a process pool when --jobs is not 1.
+
+    Results come back in the same order as files regardless of which worker finishes first.
+    pool is a process pool to use instead of starting one, watch() keeps its workers warm between batches.
+    """
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if pool is None and (jobs == 1 or len(files) < 2) and args.prefetch > 0:
+        return run_prefetch(files, args)
+    if pool is None and (jobs == 1 or len(files) < 2):
+        return [batch_worker(f, args) for f in files]
+    args = clone(args)  # The caller's options stay as they were
+    if not args.overwrite:  # Workers can't ask, so ask once up front
+        exists = sum(1 for f in files for o in output_paths(f, args) if o.is_file())
+        if exists and not yn(f"{exists} output files already exist, delete and make new ones?"):
+            raise Exception("Output files already exist.")
+        args.overwrite = True
+    args.screen = False  # Parallel output would be jumbled
+    chunks = max(1, len(files) // (jobs * 4))
+    if pool:
+        return list(pool.map(batch_worker, files, repeat(args), chunksize=chunks))
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"Converting with {min(jobs, len(files))} worker processes")
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        return list(pool.map(batch_worker, files, repeat(args), chunksize=chunks))
+
+
+def run_prefetch(files, args):
+    """
+    Convert a list of files in this process, reading ahead and writing behind on --prefetch threads.
+
+    A file whose output fails to write is reported as failed once all writes are done.
+    """
+    threads = io_threads(args.prefetch)
+    try:
+        results = [batch_worker(f, args, data, threads) for f, data in threads.read_ahead(files, args.stream)]
+    finally:
+        failed = threads.close()
+    return [(f, error or failed.get(f), report) for f, error, report in results]
+
+
+def sync(folder, args):
+    """
+    Bring the .txt outputs under folder up to date, returns run_batch results for the files converted.
+
+    Only new or changed files (by size and mtime against the manifest) are converted, outputs of
+    deleted files are removed, so a re-run over an unchanged library costs a stat per file.
+    """
+    record = manifest(folder)
+    changed, deleted = record.plan()
+    print(f"Sync mode. {len(changed)} new or changed, {len(deleted)} deleted, {len(record.files)} known files.")
+    for name in deleted:
+        print(f"Removing output of deleted: {name}")
+    args = clone(args)  # The caller's options stay as they were
+    args.overwrite = True  # Outputs are ours to replace
+    results = run_batch([record.folder / name for name in changed], args) if changed else []
+    record.update(changed, deleted, {Path(f).relative_to(record.folder).as_posix() for f, e, _ in results if e})
+    return results
+
+
+def warm_up(args, worker=False):
+    """
+    Do the one off work of converting with these options up front, compile the junk patterns and import modules.
+
+    A worker process leaves Ctrl+C to the main one, which then shuts the pool down cleanly.
+    """
+    if worker:
+        import signal
+
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    subtitle().set_no_names(args.nonames)
+    need("charset_normalizer", "charset-normalizer")
+    if not args.replace:
+        need("send2trash", "send2trash")
+
+
+def watch(folder, args, polls=None):
+    """
+    Keep converting new or changed subtitles in folder as they arrive, until Ctrl+C (or polls polls).
+
+    Returns the run_batch results of every file converted. Imports, compiled patterns and the --jobs
+    worker pool are set up once and stay warm, so a file is converted within a poll or two of arriving
+    rather than paying for a fresh start and a rescan each time.
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait
+
+    interval = args.watch or watch_interval
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    args = clone(args)  # The caller's options stay as they were
+    args.overwrite = True  # Outputs are ours to replace
+    spy = watcher(folder, args)
+    results = []
+    with ProcessPoolExecutor(jobs, initializer=warm_up, initargs=(args, True)) if jobs > 1 else nullcontext() as pool:
+        if pool:
+            wait([pool.submit(os.getpid) for _ in range(jobs)])  # Start every worker now, not with the first file
+            print(f"Converting with {jobs} worker processes")
+        else:
+            warm_up(args)
+        print(f"Watch mode. Checking {spy.folder} every {interval}s, {len(spy.done)} files up to date. Ctrl+C to stop.")
+        n = 0
+        try:
+            while polls is None or n < polls:
+                if n:
+                    time.sleep(interval)
+                n += 1
+                ready, deleted = spy.poll()
+                for f in deleted:
+                    print(f"Deleted: {f}")
+                batch = run_batch(list(ready), args, pool) if ready else []
+                if ready or deleted:
+                    spy.update(ready, deleted, batch)
+                    results += batch
+                    failed = sum(1 for _, e, _ in batch if e)
+                    print(f"Converted {len(batch) - failed}/{len(batch)} files, watching for more.")
+                    if args.cache:
+                        args.cache.trim()
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+    return results
+
 
 # Do things
 if __name__ == "__main__":
     args = arguments()
-    cls()
+    args.stats = args.stats or bool(args.report)
+    args.cache = cache(args.cache, args.cache_size << 20) if args.cache else None
+    reports = []
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.file == "-":  # Output goes to stdout, so everything else goes to stderr
+        sys.stdout = sys.stderr
+    else:
+        cls()
     try:
         print(f"SUB to TXT v{version}\n{'-' * 22}")
-        if args.file or args.copy:
-            file.set_file(args.file)
-            file.set_over(args.overwrite)
-            enc.check_encoding()
-            enc.force_utf8(args.utf8)  # True/False
-            sub.set_no_names(args.nonames)  # True/False
-            sub.set_no_sort(args.nosort)  # True/False
-            sub.screen_output(args.screen)  # True/False
-            sub.one_line(args.oneliners)  # True/False
-            sub.testsub()
-            if args.pause and not yn("Ready to start?"):
-                raise Exception("User exited at pause before start")
-            if args.copy:
-                copy()
-            else:
-                do_work()
-        if args.dir:
-            files = list(filter(lambda p: p.suffix in {".srt", ".vtt", ".ssa", ".ass"}, Path(args.dir).glob("*")))
+        if args.copy and (args.file == "-" or args.sync):
+            raise Exception("--copy needs files, it can't be used with stdin or --sync.")
+        if args.outputs and (args.copy or args.sync):
+            raise Exception("--outputs can't be used with --copy or --sync.")
+        if args.watch and not args.dir:
+            raise Exception("--watch needs a folder to watch, use it with --dir.")
+        if args.file:
+            st = stats(args.file) if args.stats else None
+            if args.copy or args.outputs or args.file == "-":
+                file, enc, sub = (prepare_copy if args.copy else prepare)(args.file, args, st)
+                if args.pause and not yn("Ready to start?"):
+                    raise Exception("User exited at pause before start")
+                if args.copy:
+                    with stage(st, "write"):
+                        copy(file, enc, sub)
+                    if st:
+                        st.count(file, sub)
+                elif args.outputs:
+                    do_outputs(file, enc, sub, args.outputs, args)
+                else:
+                    do_work(file, enc, sub)
+            else:  # Through convert_file() so --cache is used
+                if args.pause and not yn("Ready to start?"):
+                    raise Exception("User exited at pause before start")
+                convert_file(args.file, opts=args, st=st)
+            reports.append(st and st.report())
+        if args.dir and args.watch:
+            results = watch(args.dir, args)
+            how_many = len(results)
+        elif args.dir and args.sync:
+            results = sync(args.dir, args)
+            how_many = len(results)
+        elif args.dir:
+            files = sorted(filter(lambda p: p.suffix in suffixes, Path(args.dir).glob("*")))
+            if args.copy:  # Leave copies from earlier runs alone
+                files = [f for f in files if not f.stem.endswith("-copy")]
             how_many = len(files)
-            c = 0
             print(f"Multi file mode. Found {how_many} files. The files are:")
             for idx, f in enumerate(files):
                 print(str(idx + 1) + ": " + str(f))
             print("-" * 22)
-            for f in files:
-                file.set_file(f)
-                file.set_over(args.overwrite)
-                enc.check_encoding()
-                enc.force_utf8(args.utf8)
-                sub.testsub()
-                sub.set_no_names(args.nonames)  # True/False
-                sub.set_no_sort(args.nosort)  # True/False
-                sub.screen_output(args.screen)  # True/False
-                sub.one_line(args.oneliners)  # True/False
-                do_work()
-                print("-" * 22)
-                c += 1
-            print(f"Processed {c}/{how_many} files.")
+            results = run_batch(files, args)
+        if args.dir:
+            reports = [r for _, _, r in results]
+            failed = [(f, error) for f, error, _ in results if error is not None]
+            print(f"Processed {how_many - len(failed)}/{how_many} files.")
+            if failed:
+                print(f"{len(failed)} files failed:")
+                for f, error in failed:
+                    print(f"{f}: {error}")
         print("\nFinished!\n")
     except Exception as error:
         print(f"Script execution stopped because:\n{error}")
@@ -543,3 +2138,15 @@ if __name__ == "__main__":
             import traceback
 
             print(traceback.format_exc())
+    if args.cache:
+        args.cache.trim()
+    if args.stats:
+        stats_table(reports)
+    if args.report:
+        with open(args.report, "w", encoding="utf_8") as report:
+            json.dump({"version": version, "files": [r for r in reports if r]}, report, indent=2)
+        print(f"Stats saved to: {args.report}")
+    if args.profile:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Profile saved to: {args.profile}, view with: python -m pstats {args.profile}")
@@ -0,0 +1,64 @@
+"""Test the conversion cache."""
+
+# cSpell: disable
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from subtotxt import cache, convert_file, options, stats
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_cache(tmp_path):
+    """Unchanged files come from the cache, changed files are converted again."""
+    sub_file = tmp_path / "sub.srt"
+    shutil.copy(f"{loca}/resources/SRT_The_Beekeeper.srt", sub_file)
+    opts = options(overwrite=True, cache=cache(tmp_path / "cache"))
+    first = stats(sub_file)
+    out = convert_file(sub_file, opts=opts, st=first)
+    expected = out.read_bytes()
+    again = stats(sub_file)
+    convert_file(sub_file, opts=opts, st=again)
+    assert not first.cached and again.cached
+    assert out.read_bytes() == expected
+    with open(sub_file, "a", encoding="utf_8") as f:
+        f.write("\n9999\n01:00:00,000 --> 01:00:01,000\nOne more line\n")
+    os.utime(sub_file, ns=(0, 0))
+    changed = stats(sub_file)
+    convert_file(sub_file, opts=opts, st=changed)
+    assert not changed.cached
+    assert out.read_bytes().endswith(b"One more line\n")
+
+
+def test_cache_trim(tmp_path):
+    """Trimming bounds everything, stat records and left over temporary files included."""
+    folder = tmp_path / "cache"
+    opts = options(overwrite=True, cache=cache(folder, limit=1 << 10))
+    for n in range(40):  # A stat record per path, the outputs are mostly the same entry
+        sub_file = tmp_path / f"sub{n}.vtt"
+        shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", sub_file)
+        convert_file(sub_file, opts=opts)
+    crashed, writing = folder / "stat" / "x.json.1.tmp", folder / "stat" / "y.json.2.tmp"
+    crashed.write_bytes(b"{")
+    writing.write_bytes(b"{")
+    os.utime(crashed, (0, 0))
+    opts.cache.trim()
+    assert sum(f.stat().st_size for f in folder.glob("*/*")) <= 1 << 10
+    assert len(list(folder.glob("stat/*.json"))) < 40
+    assert not crashed.exists() and writing.exists()
+
+
+def test_cache_file(tmp_path):
+    """A second -f run with --cache gets its output from the cache."""
+    sub_file = tmp_path / "sub.srt"
+    shutil.copy(f"{loca}/resources/SRT_The_Beekeeper.srt", sub_file)
+    script = loca.parent / "subtotxt.py"
+    run = [sys.executable, script, "-f", sub_file, "--cache", tmp_path / "cache", "-o"]
+    first = subprocess.run(run, capture_output=True, check=True, text=True)
+    expected = sub_file.with_suffix(".txt").read_bytes()
+    again = subprocess.run(run, capture_output=True, check=True, text=True)
+    assert "Output from cache" not in first.stdout
+    assert "Output from cache" in again.stdout
+    assert sub_file.with_suffix(".txt").read_bytes() == expected
@@ -0,0 +1,23 @@
+"""Test the convert() API."""
+
+# cSpell: disable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from subtotxt import convert, options
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+ass_file = f"{loca}/resources/SSA_Example_400plus.ass"
+known_good = Path(f"{loca}/resources/outputs/SSA_Example_400plus.txt")
+
+
+def test_convert_matches_known_good():
+    """convert() returns the same text the file writer produces."""
+    assert convert(ass_file) == known_good.read_text(encoding="utf-8")
+
+
+def test_convert_keeps_no_state():
+    """Repeated and threaded calls must not leak text between conversions."""
+    first = convert(ass_file, options())
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(convert, [ass_file] * 8))
+    assert all(r == first for r in results)
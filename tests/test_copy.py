@@ -0,0 +1,17 @@
+"""Test --copy transcodes in blocks and copies bytes as they are when the encoding already matches."""
+
+# cSpell: disable
+from subtotxt import copy_block, copy_file, options
+
+
+def test_copy(tmp_path):
+    """A cp1252 file larger than one block comes out as UTF-8 with its line endings untouched."""
+    text = "".join(f"{n + 1}\r\n00:00:01,000 --> 00:00:02,000\r\nCafé {n}\r\n\r\n" for n in range(40000))
+    assert len(text) > copy_block
+    sub_file = tmp_path / "sub.srt"
+    sub_file.write_bytes(text.encode("cp1252"))
+    out = copy_file(sub_file, options(utf8=True, detect="full"))
+    assert out.name == "sub-copy.srt"
+    assert out.read_bytes() == text.encode("utf_8")
+    again = copy_file(out, options(utf8=True))
+    assert again.read_bytes() == out.read_bytes()
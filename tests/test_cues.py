@@ -0,0 +1,78 @@
+"""Test the cue model and timecode handling."""
+
+# cSpell: disable
+from subtotxt import cue_lines, do_ass, do_srt, do_vtt, subtitle, times, ass_time
+
+ass_lines = [
+    "[Script Info]\n",
+    "ScriptType: v4.00+\n",
+    "[Events]\n",
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n",
+    "Dialogue: 0,10:00:00.00,10:00:01.00,Default,,0000,0000,0000,,Last\n",
+    "Dialogue: 0,0:10:00.00,0:10:01.00,Default,,0000,0000,0000,,Middle one\n",
+    "Dialogue: 0,0:10:00.00,0:10:01.00,Default,,0000,0000,0000,,Middle two\n",
+    "Dialogue: 0,0:00:01.50,0:00:02.00,Default,,0000,0000,0000,,First\n",
+]
+ass_reordered = [
+    "[V4+ Styles]\n",
+    "Format: Name, Fontname, Fontsize\n",
+    "[Events]\n",
+    "Format: Layer, Name, Style, End, Start, MarginL, MarginR, MarginV, Effect, Text\n",
+    "Dialogue: 0,Lupin,owari,0:00:04.00,0:00:03.00,0000,0000,0000,,Yeah, love is wonderful.\n",
+    "Comment: 0,,owari,0:00:02.00,0:00:01.00,0000,0000,0000,,Not a subtitle\n",
+    "Dialogue: 0,,owari,0:00:02.00,0:00:01.00,0000,0000,0000,,It's fantastic.\n",
+]
+ass_v1 = ["Dialogue: Marked=0,0:01:16.0,0:01:23.4,White Text,Usagi,0000,0000,0000,Pretty, Soldier\n"]
+
+srt_lines = [
+    "1\n00:00:01,000 --> 00:00:02,000\nOne\n\n",
+    "1\n00:00:02,000 --> 00:00:03,000\nTwo\n\n",  # Repeated number
+    "00:00:03,000 --> 00:00:04,000\n42\n\n",  # Missing number, text is a number
+    "7\n00:00:04,000 --> 00:00:05,000\nFour\n",  # Renumbered, no blank line before the next
+    "5\n00:00:05,000 --> 00:00:06,000\nFive\n",
+]
+vtt_lines = [
+    "WEBVTT\nKind: captions\n\n",
+    "intro\n00:01.000 --> 00:02.000 align:start\nOne\n\n",
+    "NOTE\nNot a subtitle\n\n",
+    "00:02.000 --> 00:03.000\nTwo\nlines\n",
+]
+
+
+def test_times():
+    """Timecodes are read as milliseconds, with or without hours."""
+    assert times("00:00:18,590 --> 01:00:21,389\n") == (18590, 3621389)
+    assert times("00:18.590 --> 00:21.389 align:start\n") == (18590, 21389)
+    assert ass_time("0:01:41.7") == 101700
+
+
+def test_ass_sorts_by_time_and_keeps_duplicates():
+    """Sorting is numeric, not by string, and lines starting together are all kept in file order."""
+    sub = subtitle()
+    sub.set_no_names(True)
+    cues = list(do_ass(iter(ass_lines), sub))
+    assert [c.text for c in cues] == ["First", "Middle one", "Middle two", "Last"]
+    assert (cues[0].start, cues[0].end) == (1500, 2000)
+
+
+def test_ass_uses_format_line():
+    """Columns come from the [Events] Format: line, names from the Name column, text keeps its commas."""
+    cues = list(do_ass(iter(ass_reordered), subtitle()))
+    assert [(c.start, c.end, c.name, c.text) for c in cues] == [
+        (1000, 2000, "", "It's fantastic."),
+        (3000, 4000, "Lupin", "Yeah, love is wonderful."),
+    ]
+    assert list(cue_lines(do_ass(iter(ass_v1), subtitle()))) == ["Usagi: Pretty, Soldier"]
+
+
+def test_srt_tolerates_bad_numbers():
+    """Missing, repeated and out of order numbers don't lose or mangle any subtitles."""
+    cues = list(do_srt(iter("".join(srt_lines).splitlines(keepends=True)), subtitle()))
+    assert [c.text for c in cues] == ["One", "Two", "42", "Four", "Five"]
+    assert [c.start for c in cues] == [1000, 2000, 3000, 4000, 5000]
+
+
+def test_vtt_skips_header_identifiers_and_notes():
+    """Only cue text comes out, whatever surrounds it."""
+    cues = list(do_vtt(iter("".join(vtt_lines).splitlines(keepends=True)), subtitle()))
+    assert [(c.start, c.text) for c in cues] == [(1000, "One"), (2000, "Two\nlines")]
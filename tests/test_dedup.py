@@ -0,0 +1,43 @@
+"""Test --dedup on rolling live captions."""
+
+# cSpell: disable
+from subtotxt import convert, options
+
+rolling = """WEBVTT
+
+00:00:01.000 --> 00:00:02.000
+hello wonderful
+
+00:00:02.000 --> 00:00:03.000
+hello wonderful person this is
+
+00:00:03.000 --> 00:00:04.000
+hello wonderful person this is
+Anton and today we're going
+
+00:00:04.000 --> 00:00:05.000
+hello wonderful person this is
+Anton and today we're going
+to discuss asteroids
+
+00:00:05.000 --> 00:00:06.000
+today we're going to discuss asteroids and comets
+
+00:00:06.000 --> 00:00:07.000
+hello wonderful
+"""
+
+
+def test_dedup(tmp_path):
+    """Repeats within the window and overlaps with the line before are dropped, nothing new is lost."""
+    sub_file = tmp_path / "live.vtt"
+    sub_file.write_text(rolling, encoding="utf_8")
+    assert convert(sub_file).count("hello wonderful") == 4
+    assert convert(sub_file, options(dedup=8)).splitlines() == [
+        "hello wonderful",
+        "person this is",
+        "Anton and today we're going",
+        "to discuss asteroids",
+        "and comets",
+    ]
+    assert convert(sub_file, options(dedup=2)).splitlines()[-1] == "hello wonderful"  # Outside the window
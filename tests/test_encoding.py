@@ -0,0 +1,18 @@
+"""Test encoding detection."""
+
+# cSpell: disable
+from pathlib import Path
+from subtotxt import encoding
+import pytest
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+@pytest.mark.parametrize("sub_file", sorted(Path(f"{loca}/resources").glob("*.*")), ids=lambda p: p.name)
+def test_fast_matches_full(sub_file):
+    """The fast BOM/UTF-8 path must agree with charset_normalizer on the sample files."""
+    full = encoding()
+    full.check_encoding(sub_file, "full")
+    fast = encoding()
+    fast.check_encoding(sub_file, "fast")
+    assert fast.enc == full.enc
@@ -0,0 +1,55 @@
+"""Test the resource guards, binary inputs and oversized files are refused, big ones converted in chunks."""
+
+# cSpell: disable
+import os
+import pytest
+from subtotxt import convert, looks_binary, options, run_batch
+
+text = "".join(f"{n + 1}\n00:00:01,000 --> 00:00:02,000\nCafé {n}, ça va?\n\n" for n in range(40000))
+
+
+def test_looks_binary():
+    """Videos and random bytes are binary, text in any Unicode form with or without a BOM isn't."""
+    video = b"\0\0\0\x20ftypisom\0\0\x02\0isomiso2avc1mp41" + bytes(range(256)) * 8
+    assert looks_binary(video) and looks_binary(b"\x1aE\xdf\xa3" + os.urandom(8000).replace(b"\0", b"\1"))
+    sample = text[:4000]
+    for name in ("utf_8", "cp1252", "utf_16_le", "utf_16_be", "utf_32_le", "utf_16", "utf_8_sig"):
+        assert not looks_binary(sample.encode(name)), name
+
+
+def test_binary_input_fails_alone(tmp_path):
+    """A video renamed .srt fails before detection, the rest of the batch carries on."""
+    (tmp_path / "movie.srt").write_bytes(b"\0\0\0\x20ftypisom" + bytes(range(256)) * 400)
+    (tmp_path / "sub.srt").write_text(text[:1000], encoding="utf_8")
+    results = run_batch([tmp_path / "movie.srt", tmp_path / "sub.srt"], options(overwrite=True))
+    assert [(os.path.basename(f), e is None) for f, e, _ in results] == [("movie.srt", False), ("sub.srt", True)]
+    assert "binary" in results[0][1]
+
+
+def test_size_guards(tmp_path):
+    """Files over --max-size are refused, over --memory converted a chunk at a time to the same text."""
+    sub_file = tmp_path / "big.srt"
+    sub_file.write_text(text, encoding="utf_8")
+    with pytest.raises(Exception, match="max-size"):
+        convert(sub_file, options(max_size=1))
+    assert convert(sub_file, options(memory=1)) == convert(sub_file, options(memory=0))
+
+
+def test_chunked_detects_whole_file(tmp_path):
+    """A file that is plain ascii well past the stdin sample before its first cp1252 character converts in chunks."""
+    ascii_part = "".join(f"{n + 1}\n00:00:01,000 --> 00:00:02,000\nLine {n}\n\n" for n in range(20000))
+    sub_file = tmp_path / "late.srt"
+    french = "Il était une fois, à la fenêtre, un garçon très âgé qui préférait le café crème."
+    sub_file.write_bytes((ascii_part + f"20001\n00:00:01,000 --> 00:00:02,000\n{french}\n").encode("cp1252"))
+    whole = convert(sub_file, options(memory=0))
+    assert whole.count("\n") == 20001 and convert(sub_file, options(memory=1)) == whole
+
+
+def test_prefetch_keeps_memory_limit(tmp_path, capsys):
+    """Files read ahead by --prefetch are still converted in chunks when over --memory."""
+    for name in ("a.srt", "b.srt"):
+        (tmp_path / name).write_text(text, encoding="utf_8")
+    files = [tmp_path / "a.srt", tmp_path / "b.srt"]
+    results = run_batch(files, options(overwrite=True, memory=1, prefetch=2))
+    assert all(e is None for _, e, _ in results)
+    assert capsys.readouterr().out.count("a chunk at a time") == 2
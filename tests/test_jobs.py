@@ -0,0 +1,47 @@
+"""Test --jobs spreads a batch over worker processes, results stay in order and failures are summed up."""
+
+# cSpell: disable
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from subtotxt import options, run_batch
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+names = ["SRT_The_Beekeeper.srt", "SSA_Example_300.ass", "VTT_Simple_example.vtt", "SSA_Example_400.ass"]
+
+
+def batch(folder):
+    """Copy some subtitles into folder along with one that can't be converted, returns them in name order."""
+    for name in names:
+        shutil.copy(loca / "resources" / name, folder / name)
+    (folder / "Broken.srt").write_text("Not a subtitle at all\n", encoding="utf_8")
+    return sorted(folder.iterdir())
+
+
+def test_jobs_keep_order(tmp_path):
+    """Results come back in the order given, with the same outputs as a serial run."""
+    files = batch(tmp_path)
+    results = run_batch(files, options(jobs=3, overwrite=True))
+    assert [Path(f) for f, _, _ in results] == files
+    assert [f.name for f, (_, e, _) in zip(files, results) if e] == ["Broken.srt"]
+    parallel = {f: f.with_suffix(".txt").read_bytes() for f in files if f.name != "Broken.srt"}
+    run_batch(files, options(overwrite=True))
+    assert all(f.with_suffix(".txt").read_bytes() == text for f, text in parallel.items())
+
+
+def test_jobs_leave_options(tmp_path):
+    """A parallel run doesn't change the options it was given."""
+    opts = options(jobs=2, screen=True)
+    run_batch(batch(tmp_path), opts)
+    assert not opts.overwrite and opts.screen
+
+
+def test_jobs_failure_summary(tmp_path):
+    """The command line run reports how many files worked and lists the ones that didn't."""
+    batch(tmp_path)
+    script = loca.parent / "subtotxt.py"
+    done = subprocess.run([sys.executable, script, "-d", tmp_path, "-j", "2", "-o"], capture_output=True, text=True)
+    assert "Converting with 2 worker processes" in done.stdout
+    assert "Processed 4/5 files." in done.stdout
+    assert f"1 files failed:\n{tmp_path / 'Broken.srt'}: Unable to determine Subtitle format." in done.stdout
@@ -0,0 +1,48 @@
+"""Test --oneliners sentence joining."""
+
+# cSpell: disable
+from subtotxt import convert, convert_file, ends_sentence, join_sentences, options
+
+srt = """1
+00:00:01,000 --> 00:00:02,000
+It says "install."
+
+2
+00:00:02,000 --> 00:00:03,000
+Can you click
+on that “button?”
+
+3
+00:00:03,000 --> 00:00:04,000
+你打算怎么处理牠们？
+这是我和牠们之间的事
+
+4
+00:00:04,000 --> 00:00:05,000
+「不劳妳费心了。」
+Unfinished
+"""
+
+
+def test_ends_sentence():
+    """Unicode terminators count, also when closing quotes or brackets follow them."""
+    assert all(map(ends_sentence, ['"install."', "(button?)", "牠们？", "「费心了。」", "Wait…", "لماذا؟", "है।"]))
+    assert not any(map(ends_sentence, ["Can you click", "Mr", '"', ""]))
+    assert list(join_sentences(["a", "b.", "c"])) == ["a b.", "c"]
+
+
+def test_oneliners(tmp_path):
+    """Whole sentences per line, an unfinished one at the end has no trailing space, --stream agrees."""
+    sub_file = tmp_path / "sub.srt"
+    sub_file.write_text(srt, encoding="utf_8")
+    expected = [
+        'It says "install."',
+        "Can you click on that “button?”",
+        "你打算怎么处理牠们？",
+        "这是我和牠们之间的事 「不劳妳费心了。」",
+        "Unfinished",
+    ]
+    assert convert(sub_file, options(oneliners=True)).splitlines() == expected
+    out = tmp_path / "stream.txt"
+    convert_file(sub_file, out, options(oneliners=True, stream=True))
+    assert out.read_text(encoding="utf_8") == "\n".join(expected) + "\n"
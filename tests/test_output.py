@@ -0,0 +1,29 @@
+"""Test outputs are replaced atomically."""
+
+# cSpell: disable
+import shutil
+from pathlib import Path
+import pytest
+from subtotxt import atomic_write, convert_file, options
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_atomic_write(tmp_path):
+    """A failed write leaves the old output and no temporary file behind."""
+    out = tmp_path / "out.txt"
+    out.write_text("old")
+    with pytest.raises(ValueError), atomic_write(out, encoding="utf_8") as new:
+        new.write("half of the new")
+        raise ValueError
+    assert out.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [out]
+
+
+def test_replace(tmp_path):
+    """With replace the old output is swapped for the new one."""
+    shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", tmp_path / "sub.vtt")
+    (tmp_path / "sub.txt").write_text("old")
+    convert_file(tmp_path / "sub.vtt", opts=options(overwrite=True, replace=True))
+    assert (tmp_path / "sub.txt").read_text() != "old"
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["sub.txt", "sub.vtt"]
@@ -0,0 +1,59 @@
+"""Test --outputs writes the same variants as separate runs would."""
+
+# cSpell: disable
+import shutil
+import time
+from pathlib import Path
+import pytest
+import subtotxt
+from subtotxt import convert, convert_outputs, options, stats
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_outputs(tmp_path):
+    """Each variant matches convert() with the same options, from one read."""
+    sub_file = tmp_path / "sub.ass"
+    shutil.copy(f"{loca}/resources/SSA_Example_300.ass", sub_file)
+    paths = convert_outputs(sub_file, "plain,nonames,nonames+oneliners,nosort,utf8")
+    assert [p.name for p in paths] == [
+        "sub.txt",
+        "sub-nonames.txt",
+        "sub-nonames-oneliners.txt",
+        "sub-nosort.txt",
+        "sub-utf8.txt",
+    ]
+    for path, opts in zip(
+        paths,
+        [options(), options(nonames=True), options(nonames=True, oneliners=True), options(nosort=True), options()],
+    ):
+        assert path.read_text(encoding="utf_8") == convert(sub_file, opts)
+    with pytest.raises(Exception, match="Unknown --outputs variant"):
+        convert_outputs(sub_file, "plain,shouting")
+
+
+def test_outputs_stats(tmp_path, monkeypatch):
+    """Cleaning every variant is reported in full, parse time is only taken off the time that includes it."""
+    sub_file = tmp_path / "sub.vtt"
+    shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", sub_file)
+    handler, process_line, cleaned = subtotxt.handler, subtotxt.process_line, []
+
+    def slow_handler(sub):
+        def parser(original, sub):
+            time.sleep(0.05)
+            yield from handler(sub)(original, sub)
+
+        return parser
+
+    def slow_process_line(line, sub):
+        time.sleep(0.001)
+        cleaned.append(line)
+        process_line(line, sub)
+
+    monkeypatch.setattr(subtotxt, "handler", slow_handler)
+    monkeypatch.setattr(subtotxt, "process_line", slow_process_line)
+    st = stats(sub_file)
+    convert_outputs(sub_file, "plain,nonames,oneliners", options(overwrite=True), st)
+    seconds = st.report()["seconds"]
+    assert seconds["parse"] >= 0.05
+    assert seconds["clean"] >= len(cleaned) * 0.001
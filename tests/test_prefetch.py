@@ -0,0 +1,50 @@
+"""Test --prefetch reading ahead and writing behind gives the same outputs as a plain batch."""
+
+# cSpell: disable
+import shutil
+from collections import Counter
+from pathlib import Path
+import subtotxt
+from subtotxt import options, run_batch
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_prefetch(tmp_path):
+    """Outputs match a plain run, a write that fails is reported against its file."""
+    names = ["SRT_The_Beekeeper.srt", "VTT_Simple_example.vtt", "SSA_Example_400.ass"]
+    for folder in ("plain", "prefetch"):
+        (tmp_path / folder).mkdir()
+        for name in names:
+            shutil.copy(f"{loca}/resources/{name}", tmp_path / folder)
+    (tmp_path / "prefetch" / "SSA_Example_400.txt").mkdir()  # Can't be written
+    run_batch([tmp_path / "plain" / name for name in sorted(names)], options(overwrite=True))
+    files = [tmp_path / "prefetch" / name for name in sorted(names)]
+    results = run_batch(files, options(overwrite=True, prefetch=2))
+    assert [(Path(f).name, bool(error)) for f, error, _ in results] == [
+        ("SRT_The_Beekeeper.srt", False),
+        ("SSA_Example_400.ass", True),
+        ("VTT_Simple_example.vtt", False),
+    ]
+    for name in ("SRT_The_Beekeeper.txt", "VTT_Simple_example.txt"):
+        assert (tmp_path / "prefetch" / name).read_bytes() == (tmp_path / "plain" / name).read_bytes()
+
+
+def test_prefetch_reads_once(tmp_path, monkeypatch):
+    """Inputs read ahead aren't opened again, however the batch uses them."""
+    names = ["SRT_The_Beekeeper.srt", "VTT_Simple_example.vtt"]
+    for name in names:
+        shutil.copy(f"{loca}/resources/{name}", tmp_path)
+    files = [tmp_path / name for name in names]
+    opened = Counter()
+
+    def counting_open(path, *args, **kwargs):
+        opened[Path(path)] += 1
+        return open(path, *args, **kwargs)  # noqa: SIM115
+
+    monkeypatch.setattr(subtotxt, "open", counting_open, raising=False)
+    for opts in (options(copy=True), options(outputs="plain,nonames")):
+        opened.clear()
+        opts.overwrite, opts.prefetch = True, 2
+        assert all(error is None for _, error, _ in run_batch(files, opts))
+        assert [opened[f] for f in files] == [1, 1]
@@ -0,0 +1,25 @@
+"""Test subtitle format detection."""
+
+# cSpell: disable
+from pathlib import Path
+from subtotxt import subtitle
+import pytest
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+formats = {"SRT": "srt", "VTT": "vtt", "SSA": "ass"}  # Sample files are named after their format
+
+
+@pytest.mark.parametrize("sub_file", sorted(Path(f"{loca}/resources").glob("*.*")), ids=lambda p: p.name)
+def test_sniff(sub_file):
+    """Each sample file is detected as the format in its name."""
+    sub = subtitle()
+    with open(sub_file, "r", encoding="utf_8_sig") as ts:
+        sub.sniff(ts)
+    assert sub.format == formats[sub_file.name[:3]]
+
+
+def test_sniff_vtt_with_style_text():
+    """A WebVTT file mentioning `Style:` is still WebVTT."""
+    sub = subtitle()
+    sub.sniff(iter(["WEBVTT\n", "\n", "00:01.000 --> 00:02.000\n", "Style: is everything\n"] * 5))
+    assert sub.format == "vtt"
@@ -0,0 +1,55 @@
+"""Test --stats counting and timing each stage, and the --report JSON."""
+
+# cSpell: disable
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from subtotxt import convert_file, options, stage_names, stats
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+srt = """1
+00:00:01,000 --> 00:00:02,000
+<i>Hello</i> there
+
+2
+00:00:02,000 --> 00:00:03,000
+[MUSIC] Two
+lines
+
+3
+00:00:03,000 --> 00:00:04,000
+[MUSIC]
+"""
+
+
+def test_stats_counts(tmp_path):
+    """Bytes, lines, cues and junk removed are counted the same whole or streamed, every stage is timed."""
+    sub_file = tmp_path / "sub.srt"
+    sub_file.write_text(srt, encoding="utf_8")
+    for stream in (False, True):
+        st = stats(sub_file)
+        convert_file(sub_file, opts=options(overwrite=True, stream=stream), st=st)
+        report = st.report()
+        counts = [report[k] for k in ("bytes", "lines", "cues", "subs", "cached")]
+        assert counts == [sub_file.stat().st_size, 4, 3, 4, False]  # 4 lines, <i> </i> and two [MUSIC] removed
+        assert list(report["seconds"]) == stage_names and all(t >= 0 for t in report["seconds"].values())
+        assert report["total"] == sum(report["seconds"].values())
+
+
+def test_report_json(tmp_path):
+    """--report saves a report per file with the per stage times adding up to each total."""
+    for name in ("SRT_The_Beekeeper.srt", "SSA_Example_300.ass"):
+        shutil.copy(loca / "resources" / name, tmp_path)
+    out = tmp_path / "report.json"
+    script = loca.parent / "subtotxt.py"
+    subprocess.run([sys.executable, script, "-d", tmp_path, "-o", "--report", out], capture_output=True, check=True)
+    report = json.loads(out.read_text())
+    assert set(report) == {"version", "files"}
+    assert [Path(r["file"]).name for r in report["files"]] == ["SRT_The_Beekeeper.srt", "SSA_Example_300.ass"]
+    keys = {"file", "seconds", "total", "bytes", "lines", "cues", "subs", "cached"}
+    for r in report["files"]:
+        assert set(r) == keys and list(r["seconds"]) == stage_names
+        assert abs(r["total"] - sum(r["seconds"].values())) < 1e-9
+        assert r["bytes"] == (tmp_path / Path(r["file"]).name).stat().st_size and r["cues"] > 0 and r["lines"] > 0
@@ -0,0 +1,44 @@
+"""Test --stream, reading stdin and writing stdout, and sorting .ssa/.ass lines within --window."""
+
+# cSpell: disable
+import subprocess
+import sys
+from pathlib import Path
+from subtotxt import convert, do_ass, subtitle
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+script = loca.parent / "subtotxt.py"
+
+
+def run_stdin(data, *args):
+    """Run the script with data on stdin, returns (stdout bytes, stderr text)."""
+    done = subprocess.run([sys.executable, script, "-f", "-", *args], input=data, capture_output=True, check=True)
+    return done.stdout, done.stderr.decode("utf_8", errors="replace")
+
+
+def test_stdin_to_stdout():
+    """Piped through, the output matches converting the file, only the text goes to stdout."""
+    for name in ("SRT_The_Beekeeper.srt", "SSA_Example_300.ass"):
+        path = loca / "resources" / name
+        out, err = run_stdin(path.read_bytes())
+        assert out.decode("utf_8_sig") == convert(path)
+        assert "Finished!" in err
+
+
+def test_stdin_bad_bytes_after_sample():
+    """A byte past the detection sample that doesn't fit is replaced with a warning, the rest still comes out."""
+    text = "".join(f"{n + 1}\n00:00:01,000 --> 00:00:02,000\nLine {n}\n\n" for n in range(4000))
+    text += "4001\n00:00:03,000 --> 00:00:04,000\nCafé\n\n4002\n00:00:05,000 --> 00:00:06,000\nEnd\n"
+    out, err = run_stdin(text.encode("cp1252"))
+    assert out.decode("utf_8").splitlines()[-2:] == ["Caf�", "End"]
+    assert "1 bytes of stdin" in err
+
+
+def test_window_sorts_nearby_lines():
+    """Lines out of order within the window are sorted, equal starts keep file order, later stragglers don't."""
+    starts = [2, 3, 1, 4, 4, 6, 7, 8, 9, 5]
+    lines = ["[Events]\n", "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"]
+    lines += [f"Dialogue: 0,0:00:0{s}.00,0:00:09.00,Default,,0,0,0,,{n}\n" for n, s in enumerate(starts)]
+    sub = subtitle()
+    sub.window = 2
+    assert [c.text for c in do_ass(iter(lines), sub)] == ["2", "0", "1", "3", "4", "5", "6", "9", "7", "8"]
@@ -0,0 +1,26 @@
+"""Test --sync only converts new or changed files and cleans up after deleted ones."""
+
+# cSpell: disable
+import os
+import shutil
+from pathlib import Path
+from subtotxt import manifest, options, sync
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_sync(tmp_path):
+    """First run converts everything, a re-run nothing, then only what changed."""
+    (tmp_path / "season 1").mkdir()
+    shutil.copy(f"{loca}/resources/SRT_The_Beekeeper.srt", tmp_path / "a.srt")
+    shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", tmp_path / "season 1" / "b.vtt")
+    opts = options()
+    assert len(sync(tmp_path, opts)) == 2
+    assert not opts.overwrite  # Forced for sync only
+    assert (tmp_path / "a.txt").is_file() and (tmp_path / "season 1" / "b.txt").is_file()
+    assert sync(tmp_path, opts) == []
+    os.utime(tmp_path / "a.srt", ns=(0, 0))
+    (tmp_path / "season 1" / "b.vtt").unlink()
+    assert [Path(f).name for f, _, _ in sync(tmp_path, opts)] == ["a.srt"]
+    assert not (tmp_path / "season 1" / "b.txt").exists()
+    assert list(manifest(tmp_path).files) == ["a.srt"]
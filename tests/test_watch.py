@@ -0,0 +1,43 @@
+"""Test --watch picks up new, changed and deleted files as they come and go."""
+
+# cSpell: disable
+import shutil
+import time
+from pathlib import Path
+from subtotxt import manifest, options, watch, watcher
+
+loca = Path(__file__).parent.absolute()  # Maps basedir to location of this file.
+
+
+def test_watch(tmp_path):
+    """Files waiting at start are converted on the first poll, once converted they're left alone."""
+    shutil.copy(f"{loca}/resources/SRT_The_Beekeeper.srt", tmp_path / "a.srt")
+    opts = options(watch=0.01)
+    assert [Path(f).name for f, _, _ in watch(tmp_path, opts, polls=2)] == ["a.srt"]
+    assert not opts.overwrite  # Forced for watch only
+    assert (tmp_path / "a.txt").is_file()
+    assert watch(tmp_path, opts, polls=1) == []
+
+
+def test_watcher_waits_for_files_to_settle(tmp_path):
+    """A new file is ready once unchanged between polls, a changed one again, deletions are reported."""
+    spy = watcher(tmp_path, options())
+    time.sleep(0.05)
+    shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", tmp_path / "b.vtt")
+    assert spy.poll() == ({}, [])  # Just arrived, might still be being written
+    ready, _ = spy.poll()
+    assert list(ready) == [tmp_path / "b.vtt"]
+    spy.update(ready, [], [])
+    assert spy.poll() == ({}, [])
+    (tmp_path / "b.vtt").unlink()
+    assert spy.poll() == ({}, [tmp_path / "b.vtt"])
+
+
+def test_watch_sync(tmp_path):
+    """With sync sub folders are watched and the manifest kept, so a restart has nothing to do."""
+    (tmp_path / "season 1").mkdir()
+    shutil.copy(f"{loca}/resources/VTT_Simple_example.vtt", tmp_path / "season 1" / "b.vtt")
+    opts = options(watch=0.01, sync=True)
+    assert len(watch(tmp_path, opts, polls=1)) == 1
+    assert list(manifest(tmp_path).files) == ["season 1/b.vtt"]
+    assert watch(tmp_path, opts, polls=1) == []